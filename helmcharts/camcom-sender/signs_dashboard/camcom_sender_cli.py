@@ -14,7 +14,7 @@ from signs_dashboard.services.camcom.camcom_sender import CamcomSenderService
 from signs_dashboard.services.events.frames_lifecycle import FramesLifecycleService
 from signs_dashboard.services.frames import FramesService
 from signs_dashboard.services.interest_zones import InterestZonesService
-from signs_dashboard.services.kafka_service import KafkaService, commit_single_message
+from signs_dashboard.services.kafka_service import KafkaService, commit_batch, poll_batches
 from signs_dashboard.services.prediction import IZ_PREDICTOR_NAME, PredictionService
 
 logger = logging.getLogger(__name__)
@@ -43,29 +43,67 @@ def camcom_sender(
     if modules_config.is_map_matching_enabled():
         frame_event_types = REQUIRED_FRAME_EVENT_TYPES_W_MAPMATCHING
 
-    for message in consumer:
-        track_uuid = parse_message_key(message)
+    for messages in poll_batches(consumer):
+        _process_frame_events(
+            messages,
+            frame_event_types=frame_event_types,
+            camcom_sender_service=camcom_sender_service,
+            prediction_service=prediction_service,
+            frames_service=frames_service,
+            frames_lifecycle_services=frames_lifecycle_services,
+            interest_zones_service=interest_zones_service,
+        )
+        commit_batch(consumer, messages)
 
-        try:
-            event, frame = parse_frame_from_lifecycle_event_to_camcom(
-                message,
-                expected_event_types=frame_event_types,
-                frames_service=frames_service,
-            )
-        except ParseMessageError as exp:
-            logger.exception(
-                f'Unable to parse message {message.topic} with track_uuid {track_uuid}, skiping event: {exp.message}',
-            )
-            event, frame = None, None
 
+def _process_frame_events(
+    messages: list[ConsumerRecord],
+    frame_event_types: tuple[FrameEventType, ...],
+    camcom_sender_service: CamcomSenderService,
+    prediction_service: PredictionService,
+    frames_service: FramesService,
+    frames_lifecycle_services: FramesLifecycleService,
+    interest_zones_service: InterestZonesService,
+):
+    events_and_frames = []
+    for message in messages:
+        event, frame = _parse_frame_event(message, frame_event_types=frame_event_types, frames_service=frames_service)
         if event and frame:
-            if event.event_type == FrameEventType.prediction_required and event.recalculate_interest_zones:
-                interest_zones_service.update_frame_interest_zones(frame)
-                frames_lifecycle_services.produce_pro_resend_event(frame_id=frame.id, track_uuid=frame.track_uuid)
-            attributes = prediction_service.get_frame_attributes(frame, IZ_PREDICTOR_NAME)
-            camcom_sender_service.send(frame, attributes)
+            events_and_frames.append((event, frame))
+
+    # zones are matched for the whole batch at once, before frames attributes are read
+    recalculate_frames = [
+        frame
+        for event, frame in events_and_frames
+        if event.event_type == FrameEventType.prediction_required and event.recalculate_interest_zones
+    ]
+    if recalculate_frames:
+        interest_zones_service.update_frames_interest_zones(recalculate_frames)
+        for frame in recalculate_frames:
+            frames_lifecycle_services.produce_pro_resend_event(frame_id=frame.id, track_uuid=frame.track_uuid)
+
+    for _, frame in events_and_frames:
+        attributes = prediction_service.get_frame_attributes(frame, IZ_PREDICTOR_NAME)
+        camcom_sender_service.send(frame, attributes)
+
 
-        commit_single_message(consumer, message)
+def _parse_frame_event(
+    message: ConsumerRecord,
+    frame_event_types: tuple[FrameEventType, ...],
+    frames_service: FramesService,
+) -> tuple[Optional[AnyFrameEvent], Optional[Frame]]:
+    try:
+        return parse_frame_from_lifecycle_event_to_camcom(
+            message,
+            expected_event_types=frame_event_types,
+            frames_service=frames_service,
+        )
+    except ParseMessageError as exp:
+        track_uuid = parse_message_key(message)
+        logger.exception(
+            f'Unable to parse message {message.topic} with track_uuid {track_uuid}, skiping event: {exp.message}',
+        )
+        return None, None
 
 
 def parse_frame_from_lifecycle_event_to_camcom(  # noqa: C901
@@ -71,7 +71,7 @@ class ServicesContainer(containers.DeclarativeContainer):
         s3_client=s3_client,
         s3_keys=s3_keys,
     )
-    kafka = providers.Factory(KafkaService, config=config.kafka, modules_config=modules_config)
+    kafka = providers.Singleton(KafkaService, config=config.kafka, modules_config=modules_config)
 
     translations = providers.Factory(
         TranslationsService,
@@ -1,6 +1,7 @@
 import os
 from datetime import datetime, timedelta, timezone
 from enum import Enum
+from functools import cached_property
 from itertools import groupby
 from operator import attrgetter
 from typing import TYPE_CHECKING, Optional
@@ -121,6 +122,16 @@ class Frame(Base):
         grouper = attrgetter('label')
         return groupby(sorted(self.detections, key=grouper), key=grouper)
 
+    @cached_property
+    def detections_by_detector(self) -> dict[str, list['BBOXDetection']]:
+        """
+        детекции, сгруппированные по имени детектора, строятся один раз на загруженный кадр
+        """
+        grouped_detections = {}
+        for detection in self.detections:
+            grouped_detections.setdefault(detection.detector_name, []).append(detection)
+        return grouped_detections
+
     @property
     def detections_as_manual_prediction(self) -> dict:
         return {
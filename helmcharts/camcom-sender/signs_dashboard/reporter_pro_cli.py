@@ -16,7 +16,7 @@ from signs_dashboard.schemas.events.detected_objects_lifecycle import DetectedOb
 from signs_dashboard.schemas.events.frame_lifecycle import FrameEventType
 from signs_dashboard.schemas.events.tracks_lifecycle import TrackEventType
 from signs_dashboard.services.frames import FramesService
-from signs_dashboard.services.kafka_service import KafkaService, commit_single_message
+from signs_dashboard.services.kafka_service import KafkaService, commit_batch, poll_batches
 from signs_dashboard.services.twogis_pro.synchronization import TwoGisProSyncService
 
 logger = logging.getLogger(__name__)
@@ -52,14 +52,15 @@ def run(
 ):
     consumer = kafka_service.get_pro_reporter_consumer()
 
-    for message in consumer:
-        if message.topic == kafka_service.topics.frames_lifecycle:
-            _handle_frame_event(message, twogis_pro_sync_service, frames_service=frames_service)
-        elif message.topic == kafka_service.topics.objects_lifecycle:
-            _handle_object_event(message, twogis_pro_sync_service)
-        elif message.topic == kafka_service.topics.tracks_lifecycle:
-            _handle_track_event(message, twogis_pro_sync_service)
-        commit_single_message(consumer, message)
+    for messages in poll_batches(consumer):
+        for message in messages:
+            if message.topic == kafka_service.topics.frames_lifecycle:
+                _handle_frame_event(message, twogis_pro_sync_service, frames_service=frames_service)
+            elif message.topic == kafka_service.topics.objects_lifecycle:
+                _handle_object_event(message, twogis_pro_sync_service)
+            elif message.topic == kafka_service.topics.tracks_lifecycle:
+                _handle_track_event(message, twogis_pro_sync_service)
+        commit_batch(consumer, messages)
 
 
 def _handle_frame_event(
@@ -3,7 +3,7 @@ import math
 import typing as tp
 from datetime import datetime
 
-from sqlalchemy import and_, delete, update
+from sqlalchemy import and_, bindparam, delete, insert, update
 from sqlalchemy.orm import InstrumentedAttribute, Query, joinedload
 
 from signs_dashboard.models.bbox_detection import BBOXDetection
@@ -18,44 +18,39 @@ class BBOXDetectionsRepository:
     def __init__(self, session_factory):
         self.session_factory = session_factory
 
-    def create(
-        self,
-        frame: Frame,
-        detector_name: str,
-        bbox: BBox,
-        label: tp.Optional[str] = None,
-        base_bbox: tp.Optional[BBOXDetection] = None,
-        polygon: list[int] = None,
-    ) -> BBOXDetection:
-        x_from, y_from, width, height = _transform_bbox(bbox.xmin, bbox.ymin, bbox.xmax, bbox.ymax)
-
-        sign = BBOXDetection(
-            frame_id=frame.id,
-            base_bbox_detection_id=base_bbox.id if base_bbox else None,
-            date=frame.date,
-            label=label or bbox.label,
-            x_from=x_from,
-            y_from=y_from,
-            width=width,
-            height=height,
-            prob=bbox.probability or 1,
-            is_side=bbox.is_side or False,
-            is_side_prob=bbox.is_side_prob or 0,
-            directions=bbox.directions,
-            directions_prob=bbox.directions_prob,
-            is_tmp=bbox.is_tmp,
-            sign_value=bbox.sign_value,
-            detector_name=detector_name,
-            attributes=bbox.attributes,
-            polygon=polygon,
-        )
+    def bulk_create(self, frame: Frame, detector_name: str, bboxes: dict[str, list[BBox]]):
+        labeled_bboxes = [(label, bbox) for label, label_bboxes in bboxes.items() for bbox in label_bboxes]
+        if not labeled_bboxes:
+            return
 
-        with self.session_factory(expire_on_commit=False) as session:
-            session.add(sign)
+        with self.session_factory() as session:
+            base_ids = session.execute(
+                insert(BBOXDetection).values([
+                    _bbox_as_detection_values(
+                        frame,
+                        detector_name=detector_name,
+                        bbox=bbox,
+                        label=label,
+                        polygon=bbox.polygon,
+                    )
+                    for label, bbox in labeled_bboxes
+                ]).returning(BBOXDetection.id),
+            ).scalars().all()
+
+            related_values = [
+                _bbox_as_detection_values(
+                    frame,
+                    detector_name=detector_name,
+                    bbox=related_bbox,
+                    base_bbox_detection_id=base_id,
+                )
+                for (_, bbox), base_id in zip(labeled_bboxes, base_ids)
+                for related_bbox in bbox.related_bboxes
+            ]
+            if related_values:
+                session.execute(insert(BBOXDetection).values(related_values))
             session.commit()
 
-        return sign
-
     def get_detection(self, detection_id: int) -> BBOXDetection:
         with self.session_factory() as session:
             return session.query(BBOXDetection).options(joinedload('frame')).get(detection_id)
@@ -111,18 +106,29 @@ class BBOXDetectionsRepository:
             )
             session.commit()
 
-    def save_location_info(self, detection: BBOXDetection):
+    def bulk_save_location_info(self, detections: list[BBOXDetection]):
+        if not detections:
+            return
+
+        stmt = update(BBOXDetection).where(
+            BBOXDetection.id == bindparam('detection_id'),
+            BBOXDetection.date == bindparam('detection_date'),
+        ).values(
+            lat=bindparam('new_lat'),
+            lon=bindparam('new_lon'),
+        )
         with self.session_factory() as session:
             session.execute(
-                update(BBOXDetection).
-                where(
-                    BBOXDetection.id == detection.id,
-                    BBOXDetection.date == detection.date,
-                ).
-                values(
-                    lat=detection.lat,
-                    lon=detection.lon,
-                ),
+                stmt,
+                [
+                    {
+                        'detection_id': detection.id,
+                        'detection_date': detection.date,
+                        'new_lat': detection.lat,
+                        'new_lon': detection.lon,
+                    }
+                    for detection in detections
+                ],
             )
             session.commit()
 
@@ -165,6 +171,37 @@ class BBOXDetectionsRepository:
             session.commit()
 
 
+def _bbox_as_detection_values(
+    frame: Frame,
+    detector_name: str,
+    bbox: BBox,
+    label: tp.Optional[str] = None,
+    base_bbox_detection_id: tp.Optional[int] = None,
+    polygon: tp.Optional[list[int]] = None,
+) -> dict:
+    x_from, y_from, width, height = _transform_bbox(bbox.xmin, bbox.ymin, bbox.xmax, bbox.ymax)
+    return {
+        'frame_id': frame.id,
+        'base_bbox_detection_id': base_bbox_detection_id,
+        'date': frame.date,
+        'label': label or bbox.label,
+        'x_from': x_from,
+        'y_from': y_from,
+        'width': width,
+        'height': height,
+        'prob': bbox.probability or 1,
+        'is_side': bbox.is_side or False,
+        'is_side_prob': bbox.is_side_prob or 0,
+        'directions': bbox.directions,
+        'directions_prob': bbox.directions_prob,
+        'is_tmp': bbox.is_tmp,
+        'sign_value': bbox.sign_value,
+        'detector_name': detector_name,
+        'attributes': bbox.attributes,
+        'polygon': polygon,
+    }
+
+
 def _transform_bbox(x_min: int, y_min: int, x_max: int, y_max: int) -> tp.Tuple[int, int, int, int]:
     x_from = math.floor(x_min)
     y_from = math.floor(y_min)
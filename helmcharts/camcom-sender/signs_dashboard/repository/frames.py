@@ -73,6 +73,22 @@ class FramesRepository:
             for frame, row in zip(frames, result):
                 frame.id = row['id']
 
+    def bulk_update_matched_coords(self, frames: tp.List[Frame]) -> None:
+        if not frames:
+            return
+
+        matched_coords = [
+            {
+                'id': frame.id,
+                'matched_lat': frame.matched_lat,
+                'matched_lon': frame.matched_lon,
+            }
+            for frame in frames
+        ]
+        with self.session_factory() as session:
+            session.bulk_update_mappings(Frame, matched_coords)
+            session.commit()
+
     def find(self, query_params: FramesQueryParameters) -> tp.List[Frame]:
         with self.session_factory(expire_on_commit=False) as session:
             query = session.query(Frame).options(joinedload(Frame.detections))
@@ -204,7 +220,13 @@ class FramesRepository:
         with self.session_factory() as session:
             return session.query(Frame).filter(Frame.id.in_(frames_ids)).all()
 
-    def get_by_track(self, track: Track, include_app_version: bool, include_api_user: bool) -> tp.List[Frame]:
+    def get_by_track(
+        self,
+        track: Track,
+        include_app_version: bool,
+        include_api_user: bool,
+        order_by_date: bool = False,
+    ) -> tp.List[Frame]:
         with self.session_factory() as session:
             query = session.query(Frame)
             query = query.filter(Frame.track_uuid == track.uuid)
@@ -217,6 +239,8 @@ class FramesRepository:
                 query = query.options(self._options_track_app_version)
             if include_api_user:
                 query = query.options(joinedload(Frame.api_user))
+            if order_by_date:
+                query = query.order_by(Frame.date.asc())
             frames = query.all()
         return frames
 
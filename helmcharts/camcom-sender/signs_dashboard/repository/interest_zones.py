@@ -1,9 +1,13 @@
-from typing import Optional
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Optional, Union
 
+from cachetools import TTLCache
 from geoalchemy2.functions import ST_AsGeoJSON
 from shapely.geometry.polygon import Polygon
-from sqlalchemy import String, cast, distinct, func, insert, select
+from sqlalchemy import Float, Integer, String, cast, column, distinct, func, insert, literal, select
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import values
 
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.models.interest_zones import (
@@ -16,6 +20,24 @@ from signs_dashboard.models.interest_zones import (
 )
 
 PolygonAndName = tuple[Polygon, Optional[str]]
+ZONES_SNAPSHOT_TTL_SEC = 60
+
+_zones_snapshots: TTLCache = TTLCache(maxsize=4, ttl=ZONES_SNAPSHOT_TTL_SEC)
+
+
+@dataclass
+class ZonesSnapshot:
+    zones: list[InterestZone]
+    name_to_zone: dict[str, InterestZone]
+    defaults: dict[str, Union[str, bool, None]]
+
+    @classmethod
+    def from_zones(cls, zones: list[InterestZone]) -> 'ZonesSnapshot':
+        return cls(
+            zones=zones,
+            name_to_zone={zone.name: zone for zone in zones},
+            defaults={zone.name: zone.default for zone in zones},
+        )
 
 
 class InterestZonesRepository:
@@ -38,12 +60,14 @@ class InterestZonesRepository:
             zone_id = session.execute(query).first()[0]
             self._recreate_zone_polygons(session, zone_id, polygons, from_srid)
             session.commit()
+        _zones_snapshots.clear()
 
     def delete_interest_zone(self, zone: InterestZone):
         with self.session_factory() as session:
             session.query(InterestZoneRegion).filter(InterestZoneRegion.zone_id == zone.id).delete()
             session.query(InterestZone).filter(InterestZone.id == zone.id).delete()
             session.commit()
+        _zones_snapshots.clear()
 
     def get_interest_zone_regions_as_geojson(self, zone: InterestZone) -> str:
         with self.session_factory() as session:
@@ -84,6 +108,13 @@ class InterestZonesRepository:
             query = query.order_by(InterestZone.name.asc())
             return query.all()
 
+    def get_zones_snapshot(self, zone_types: tuple[InterestZoneType, ...]) -> ZonesSnapshot:
+        snapshot = _zones_snapshots.get(zone_types)
+        if snapshot is None:
+            snapshot = ZonesSnapshot.from_zones(self.get_interest_zones(zone_types))
+            _zones_snapshots[zone_types] = snapshot
+        return snapshot
+
     def get_regions_for_search(self) -> list[InterestRegionInfo]:
         with self.session_factory() as session:
             query = select(
@@ -100,30 +131,40 @@ class InterestZonesRepository:
         with self.session_factory() as session:
             self._recreate_zone_polygons(session, zone.id, polygons, from_srid)
             session.commit()
+        _zones_snapshots.clear()
+
+    def select_frames_match_zones(self, frames: list[Frame], zone_types: tuple[str, ...]) -> dict[int, list]:
+        if not frames:
+            return {}
 
-    def select_frame_match_zones(self, frame: Frame, zone_types: tuple[str, ...]):
         with self.session_factory() as session:
-            subquery = select(
-                InterestZone.name.label('zone_name'),
-                func.ST_Intersects(
-                    InterestZoneRegion.region,
-                    func.ST_SetSRID(func.ST_MakePoint(frame.current_lon, frame.current_lat), SRID4326_ID),
-                ).label('match'),
-                InterestZoneRegion.name.label('region_name'),
-            )
-            subquery = subquery.select_from(InterestZoneRegion).join(InterestZone)
-            subquery = subquery.where(InterestZone.zone_type.in_(zone_types))
+            frames_points = values(
+                column('frame_id', Integer),
+                column('lon', Float),
+                column('lat', Float),
+                name='frames_points',
+            ).data([
+                (frame.id, frame.current_lon, frame.current_lat)
+                for frame in frames
+            ])
+            frame_point = func.ST_SetSRID(func.ST_MakePoint(frames_points.c.lon, frames_points.c.lat), SRID4326_ID)
 
-            query = session.query(
-                subquery.c.zone_name,
-                func.bool_or(subquery.c.match).label('match'),
-                func.array_agg(distinct(subquery.c.region_name)).label('names'),
+            query = select(
+                frames_points.c.frame_id,
+                InterestZone.name.label('zone_name'),
+                literal(True).label('match'),
+                func.array_agg(distinct(InterestZoneRegion.name)).label('names'),
             )
-            query = query.select_from(subquery)
-            query = query.filter(subquery.c.match.is_(True))
-            query = query.group_by(subquery.c.zone_name)
-            query = query.order_by(subquery.c.zone_name.asc())
-            return session.execute(query).all()
+            query = query.select_from(InterestZoneRegion).join(InterestZone)
+            query = query.join(frames_points, func.ST_Intersects(InterestZoneRegion.region, frame_point))
+            query = query.where(InterestZone.zone_type.in_(zone_types))
+            query = query.group_by(frames_points.c.frame_id, InterestZone.name)
+            query = query.order_by(frames_points.c.frame_id.asc(), InterestZone.name.asc())
+
+            frame_matches = defaultdict(list)
+            for zone_match in session.execute(query).all():
+                frame_matches[zone_match.frame_id].append(zone_match)
+            return frame_matches
 
     def _recreate_zone_polygons(self, session, zone_id: int, polygons: list[PolygonAndName], from_srid: str):
         from_srid_id = int(from_srid.replace('epsg:', ''))
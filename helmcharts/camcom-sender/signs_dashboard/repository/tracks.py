@@ -101,7 +101,7 @@ class TracksRepository:
             return query.all()
 
     def find_with_retries_requests_by_fiji_status(
-        self, statuses: list[int], max_retries: int, retries_timeout: int,
+        self, statuses: tp.Sequence[int], max_retries: int, retries_timeout: int,
     ) -> tp.List[Track]:
         with self.session_factory() as session:
             query = (
@@ -124,7 +124,7 @@ class TracksRepository:
             )
             return query.all()
 
-    def find_by_pro_status(self, statuses: tp.List[int]) -> tp.List[Track]:
+    def find_by_pro_status(self, statuses: tp.Sequence[int]) -> tp.List[Track]:
         with self.session_factory() as session:
             return session.query(Track).options(
                 joinedload(Track.upload).undefer('init_metadata'),
@@ -398,6 +398,36 @@ class TracksRepository:
                 upload_status = TrackUploadStatus(uuid=uuid)
             return upload_status
 
+    def get_upload_status_with_frames_count(self, uuid: str) -> tuple[TrackUploadStatus, int]:
+        with self.session_factory() as session:
+            frames_count = select(
+                func.count(Frame.id),
+            ).where(
+                Frame.track_uuid == TrackUploadStatus.uuid,
+            ).scalar_subquery()
+            row = session.query(
+                TrackUploadStatus,
+                frames_count,
+            ).options(
+                undefer(TrackUploadStatus.init_metadata),
+            ).filter(
+                TrackUploadStatus.uuid == uuid,
+            ).first()
+            if not row:
+                # frames are not counted without upload status, such track is not uploaded anyway
+                return TrackUploadStatus(uuid=uuid), 0
+            return row[0], row[1]
+
+    def get_upload_statuses(self, uuids: list[str], with_gps_points: bool = True) -> dict[str, TrackUploadStatus]:
+        if not uuids:
+            return {}
+        with self.session_factory() as session:
+            query = session.query(TrackUploadStatus)
+            if with_gps_points:
+                query = query.options(undefer(TrackUploadStatus.gps_points))
+            query = query.filter(TrackUploadStatus.uuid.in_(uuids))
+            return {upload_status.uuid: upload_status for upload_status in query.all()}
+
     def save_upload_status(self, upload_status):
         with self.session_factory(expire_on_commit=False) as session:
             session.add(upload_status)
@@ -514,13 +544,12 @@ class TracksRepository:
             row = session.execute(query).first()
             return dict(row)
 
-    def get_daily_gps_track_info(self, track_uuid: str):
+    def get_daily_gps_tracks_info(self, track_uuids: list[str]) -> dict[str, list]:
         with self.session_factory() as session:
             point = literal_column('points.value', type_=JSONB)
-            linestring = literal_column('gps_tracks.linestring', type_=JSONB)
-            linestring_recorded = literal_column('gps_tracks.recorded_time', type_=JSONB)
 
-            gps_tracks_subquery = select(
+            query = select(
+                TrackUploadStatus.uuid,
                 func.jsonb_agg(
                     aggregate_order_by(
                         func.jsonb_build_array(
@@ -533,7 +562,6 @@ class TracksRepository:
                         _jsonb_field_variants_as_float(point, 'timestamp', 'Timestamp'),
                     ),
                 ).label('linestring'),
-                func.array_agg(TrackUploadStatus.recorded_time).label('recorded_time'),
             ).select_from(
                 join(
                     TrackUploadStatus,
@@ -542,19 +570,11 @@ class TracksRepository:
                 ),
             ).where(
                 TrackUploadStatus.current_gps_points.isnot(None),
-                TrackUploadStatus.uuid == track_uuid,
+                TrackUploadStatus.uuid.in_(track_uuids),
             ).group_by(
                 TrackUploadStatus.uuid,
-            ).subquery()
-
-            query = select(
-                linestring,
-            ).select_from(
-                gps_tracks_subquery.alias('gps_tracks'),
-            ).order_by(
-                linestring_recorded,
             )
-            return session.execute(query).scalar()
+            return dict(session.execute(query).fetchall())
 
     def _detectors_with_new_detections_list_query(
         self,
@@ -11,14 +11,27 @@ class TracksLocalizationRepository:
     def __init__(self, session_factory):
         self._session_factory = session_factory
 
-    def create_or_update(self, track_uuid: str, detector_name: str, status: int, last_done: Optional[datetime] = None):
-        insert = postgresql.insert(TrackLocalizationStatus).values(
-            uuid=track_uuid,
-            detector_name=detector_name,
-            status=status,
-            last_done=last_done,
-            updated=func.now(),
-        )
+    def bulk_create_or_update(
+        self,
+        track_uuid: str,
+        detector_names: list[str],
+        status: int,
+        last_done: Optional[datetime] = None,
+    ):
+        if not detector_names:
+            return
+
+        # one row per detector, single upsert statement can't update same row twice
+        insert = postgresql.insert(TrackLocalizationStatus).values([
+            {
+                'uuid': track_uuid,
+                'detector_name': detector_name,
+                'status': status,
+                'last_done': last_done,
+                'updated': func.now(),
+            }
+            for detector_name in dict.fromkeys(detector_names)
+        ])
         set_if_exists = {
             TrackLocalizationStatus.status: status,
             TrackLocalizationStatus.updated: func.now(),
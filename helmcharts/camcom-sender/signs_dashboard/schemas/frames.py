@@ -1,29 +1,21 @@
-from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
 from signs_dashboard.models.frame import Frame
 
 
-@dataclass
-class FramesOperations:
-    frames_map: Dict[int, Frame] = field(default_factory=dict)
+def frames_ids_and_daterange(
+    frames: Iterable[Frame],
+) -> Tuple[List[int], Optional[datetime], Optional[datetime]]:
+    frame_ids = []
+    min_frames_date, max_frames_date = None, None
 
-    @property
-    def list_ids(self) -> List[int]:
-        return list(self.frames_map.keys())
+    for frame in frames:
+        frame_ids.append(frame.id)
+        frame_date = frame.date
+        if min_frames_date is None or min_frames_date > frame_date:
+            min_frames_date = frame_date
+        if max_frames_date is None or max_frames_date < frame_date:
+            max_frames_date = frame_date
 
-    @property
-    def min_max_frames_date(self) -> (Optional[datetime], Optional[datetime]):
-        min_frames_date, max_frames_date = None, None
-
-        if self.frames_map:
-            frames = list(self.frames_map.values())
-            min_frames_date, max_frames_date = frames[0].date, frames[0].date
-            for frame in frames:
-                if min_frames_date > frame.date:
-                    min_frames_date = frame.date
-                if max_frames_date < frame.date:
-                    max_frames_date = frame.date
-
-        return min_frames_date, max_frames_date
+    return frame_ids, min_frames_date, max_frames_date
@@ -3,6 +3,7 @@ import os
 from datetime import date, datetime
 from typing import Optional, Union
 
+from cachetools import TTLCache
 from ratelimiter import RateLimiter
 
 from signs_dashboard.models.camcom_job import CamcomJob, CamcomJobStatus
@@ -17,6 +18,10 @@ from signs_dashboard.services.users import UsersService
 logger = logging.getLogger(__name__)
 
 MOMRAH_DRIVER_ID_OIDC_FIELD = os.environ.get('CAMCOM_INSPECTOR_ID_USER_OIDC_FIELD', 'id_no')
+# frames of a track share driver, so inspector id is looked up once per driver and refreshed after ttl
+INSPECTOR_IDS_CACHE_SIZE = 1024
+INSPECTOR_IDS_CACHE_TTL_SEC = 600
+_NOT_CACHED = object()
 
 
 class CamcomSenderService:
@@ -51,6 +56,7 @@ class CamcomSenderService:
         self._frames_image_service = frames_image_service
         self._interest_zones_service = interest_zones_service
         self._users_service = users_service
+        self._inspector_ids_cache = TTLCache(maxsize=INSPECTOR_IDS_CACHE_SIZE, ttl=INSPECTOR_IDS_CACHE_TTL_SEC)
 
     def send(self, frame: Frame, frame_attributes: dict[str, Union[str, int, None]]):
         job_id = str(frame.id)
@@ -120,9 +126,8 @@ class CamcomSenderService:
         s3_info = self._frames_image_service.get_s3_location_info(frame)
 
         inspector_info = {}
-        api_user = self._users_service.get_by_email(frame.track_email)
-        if api_user and api_user.oidc_meta and api_user.oidc_meta.get(MOMRAH_DRIVER_ID_OIDC_FIELD):
-            inspector_info = {'inspector_id': api_user.oidc_meta[MOMRAH_DRIVER_ID_OIDC_FIELD]}
+        if inspector_id := self._get_inspector_id(frame.track_email):
+            inspector_info = {'inspector_id': inspector_id}
 
         logger.info(f'Zones attributes for frame {frame.id}: {zones_attributes}')
 
@@ -138,3 +143,15 @@ class CamcomSenderService:
                 **inspector_info,
             },
         )
+
+    def _get_inspector_id(self, email: str) -> Optional[str]:
+        inspector_id = self._inspector_ids_cache.get(email, _NOT_CACHED)
+        if inspector_id is not _NOT_CACHED:
+            return inspector_id
+
+        inspector_id = None
+        api_user = self._users_service.get_by_email(email)
+        if api_user and api_user.oidc_meta:
+            inspector_id = api_user.oidc_meta.get(MOMRAH_DRIVER_ID_OIDC_FIELD)
+        self._inspector_ids_cache[email] = inspector_id
+        return inspector_id
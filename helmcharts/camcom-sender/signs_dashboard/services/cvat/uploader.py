@@ -14,7 +14,7 @@ from signs_dashboard.modules_config import ModulesConfig
 from signs_dashboard.repository.cvat_upload import CVATUploadTaskRepository
 from signs_dashboard.services.cvat.session import CVATSession
 from signs_dashboard.services.frames import FramesService
-from signs_dashboard.services.kafka_service import KafkaService
+from signs_dashboard.services.kafka_service import PRODUCER_PROFILE_FAST, KafkaService
 from signs_dashboard.small_utils import batch_iterator
 
 MAX_FRAMES_IN_TASK = 200
@@ -86,7 +86,7 @@ class CVATUploader:
         project = self.get_or_create_project_by_name(project_name)
         upload_uuid = str(uuid.uuid4())
         uploaded_frames = [frame for frame in frames if frame.uploaded_photo]
-        producer = self._kafka_service.get_producer()
+        producer = self._kafka_service.get_producer(profile=PRODUCER_PROFILE_FAST)
         for batch_num, frames_batch in enumerate(batch_iterator(uploaded_frames, MAX_FRAMES_IN_TASK)):
             frames_ids = [frame.id for frame in frames_batch]
             task_name = f'{upload_uuid}-{batch_num}'
@@ -100,7 +100,7 @@ class CVATUploader:
                     'frame_ids': frames_ids,
                 },
             )
-        producer.close()
+        producer.flush()
         return upload_uuid
 
     def upload_task(self, task_name: str, project_id: int, upload_uuid: str, frame_ids: list[int]):
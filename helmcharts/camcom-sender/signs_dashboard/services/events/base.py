@@ -2,9 +2,10 @@ import logging
 from typing import Generic, TypeVar
 
 from kafka import KafkaProducer
+from kafka.producer.future import FutureRecordMetadata
 from pydantic import BaseModel
 
-from signs_dashboard.services.kafka_service import KafkaService
+from signs_dashboard.services.kafka_service import KafkaService, utf8_serializer
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +21,22 @@ class BaseLifecycleService(Generic[EventType]):
     def producer(self) -> KafkaProducer:
         if not self._producer:
             self._producer = self._kafka_service.get_producer(
-                key_serializer=lambda key: key.encode('utf-8'),
-                value_serializer=lambda val: val.encode('utf-8'),
+                key_serializer=utf8_serializer,
+                value_serializer=utf8_serializer,
             )
         return self._producer
 
-    def _send(self, topic: str, event: EventType, event_key: str):
+    def wait_sent(self, future: FutureRecordMetadata):
+        future.get(self._kafka_service.producer_timeout_seconds)
+
+    def _send(self, topic: str, event: EventType, event_key: str, wait: bool = True) -> FutureRecordMetadata:
         logger.debug(f'Serializing {event.json()}')
         future = self.producer.send(
             topic,
             key=event_key,
             value=event.json(),
         )
-        future.get(self._kafka_service.producer_timeout_seconds)
+        # without waiting producer is free to batch events, caller must wait_sent() on returned future
+        if wait:
+            self.wait_sent(future)
+        return future
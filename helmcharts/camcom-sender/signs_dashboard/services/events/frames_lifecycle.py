@@ -1,6 +1,8 @@
 import logging
 from typing import Optional, Type
 
+from kafka.producer.future import FutureRecordMetadata
+
 from signs_dashboard.models.bbox_detection import BBOXDetection
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.schemas.events.frame_lifecycle import (
@@ -46,7 +48,8 @@ class FramesLifecycleService(BaseLifecycleService[AnyFrameEvent]):
         prompt: Optional[str],
         theta: Optional[int] = None,
         recalculate_interest_zones: bool = False,
-    ):
+        wait: bool = True,
+    ) -> FutureRecordMetadata:
         return self._produce_prediction_required_event(
             frame=frame,
             required_predictors=required_predictors,
@@ -55,6 +58,7 @@ class FramesLifecycleService(BaseLifecycleService[AnyFrameEvent]):
             event_class=PredictionRequiredFrameEvent,
             event_type=FrameEventType.prediction_required,
             recalculate_interest_zones=recalculate_interest_zones,
+            wait=wait,
         )
 
     def produce_prediction_on_bboxes_required_event(
@@ -105,8 +109,9 @@ class FramesLifecycleService(BaseLifecycleService[AnyFrameEvent]):
         theta: Optional[int],
         event_class: Type[AnyFrameEvent],
         event_type: FrameEventType,
+        wait: bool = True,
         **kwargs,
-    ):
+    ) -> FutureRecordMetadata:
         if frame.panoramic:
             image_url = self._image_service.get_s3_track360_crop_path(frame, theta)
             frame_type = FrameType.video360
@@ -114,8 +119,9 @@ class FramesLifecycleService(BaseLifecycleService[AnyFrameEvent]):
             image_url = self._image_service.get_s3_path(frame)
             frame_type = None
 
-        self._produce_event(
+        return self._produce_event(
             track_uuid=frame.track_uuid,
+            wait=wait,
             event=event_class(
                 frame_id=frame.id,
                 event_type=event_type,
@@ -137,9 +143,10 @@ class FramesLifecycleService(BaseLifecycleService[AnyFrameEvent]):
             ),
         )
 
-    def _produce_event(self, track_uuid: str, event: AnyFrameEvent):
-        self._send(
+    def _produce_event(self, track_uuid: str, event: AnyFrameEvent, wait: bool = True) -> FutureRecordMetadata:
+        return self._send(
             event_key=track_uuid,
             event=event,
             topic=self._kafka_service.topics.frames_lifecycle,
+            wait=wait,
         )
@@ -39,6 +39,9 @@ class FramesService:
     def save(self, frame: Frame):
         self._frames_repository.upsert(frame)
 
+    def bulk_update_matched_coords(self, frames: tp.List[Frame]):
+        self._frames_repository.bulk_update_matched_coords(frames)
+
     def find(self, query_params: FramesQueryParameters) -> tp.List[Frame]:
         return self._frames_repository.find(query_params)
 
@@ -82,8 +85,13 @@ class FramesService:
     def get_frames(self, frames_ids: tp.List[int]) -> tp.List[Frame]:
         return self._frames_repository.get_frames(frames_ids)
 
-    def get_by_track(self, track: Track) -> tp.List[Frame]:
-        return self._frames_repository.get_by_track(track, include_app_version=False, include_api_user=False)
+    def get_by_track(self, track: Track, order_by_date: bool = False) -> tp.List[Frame]:
+        return self._frames_repository.get_by_track(
+            track,
+            include_app_version=False,
+            include_api_user=False,
+            order_by_date=order_by_date,
+        )
 
     def get_by_track_for_localization(self, track: Track, ignore_predictions_status: bool) -> tp.List[Frame]:
         return self._frames_repository.get_by_track_for_localization(
@@ -8,7 +8,7 @@ from signs_dashboard.models.interest_zones import (
     InterestZone,
     InterestZoneType,
 )
-from signs_dashboard.repository.interest_zones import InterestZonesRepository, PolygonAndName
+from signs_dashboard.repository.interest_zones import InterestZonesRepository, PolygonAndName, ZonesSnapshot
 from signs_dashboard.services.prediction import PredictionService
 
 logger = logging.getLogger(__name__)
@@ -47,21 +47,35 @@ class InterestZonesService:
         self._interest_zones_repository.recreate_zone_polygons(zone, polygons, from_srid=from_srid)
 
     def update_frame_interest_zones(self, frame: Frame):
-        zones_attributes = self._get_interest_zones_attributes(frame)
-        if zones_attributes:
-            self._prediction_service.save_interest_zones_attributes(frame, zones_attributes)
-
-    def _get_interest_zones_attributes(self, frame: Frame) -> dict[str, Union[str, bool]]:  # noqa: WPS231
-        zones = self._interest_zones_repository.get_interest_zones(INTEREST_ZONE_TYPE_PRODUCE_ATTRIBUTE)
-        if not zones:
-            return {}
-
-        matches = self._interest_zones_repository.select_frame_match_zones(frame, INTEREST_ZONE_TYPE_PRODUCE_ATTRIBUTE)
-        zone_name_to_zone: dict[str, InterestZone] = {zone.name: zone for zone in zones}
-
-        attributes = self._get_default_attributes(zones)
+        self.update_frames_interest_zones([frame])
+
+    def update_frames_interest_zones(self, frames: list[Frame]):
+        zones_snapshot = self._interest_zones_repository.get_zones_snapshot(INTEREST_ZONE_TYPE_PRODUCE_ATTRIBUTE)
+        if not zones_snapshot.zones or not frames:
+            return
+
+        frames_matches = self._interest_zones_repository.select_frames_match_zones(
+            frames,
+            INTEREST_ZONE_TYPE_PRODUCE_ATTRIBUTE,
+        )
+        for frame in frames:
+            zones_attributes = self._get_interest_zones_attributes(
+                frame,
+                zones_snapshot=zones_snapshot,
+                matches=frames_matches.get(frame.id, []),
+            )
+            if zones_attributes:
+                self._prediction_service.save_interest_zones_attributes(frame, zones_attributes)
+
+    def _get_interest_zones_attributes(  # noqa: WPS231
+        self,
+        frame: Frame,
+        zones_snapshot: ZonesSnapshot,
+        matches: list,
+    ) -> dict[str, Union[str, bool]]:
+        attributes = dict(zones_snapshot.defaults)
         for zone_match in matches:
-            zone = zone_name_to_zone.get(zone_match.zone_name)
+            zone = zones_snapshot.name_to_zone.get(zone_match.zone_name)
             if not zone:
                 raise ValueError(f'Unknown zone type: {zone_match.zone_name}')
 
@@ -73,6 +87,3 @@ class InterestZonesService:
                     continue
                 attributes.update({zone.name: zone_match.names[0] if zone_match.names else None})
         return attributes
-
-    def _get_default_attributes(self, zones: list[InterestZone]) -> dict[str, Union[str, bool]]:
-        return {zone.name: zone.default for zone in zones}
@@ -1,9 +1,11 @@
-import json
 import logging
 import ssl
+import threading
 import typing as tp
+from collections.abc import Iterator
 from dataclasses import dataclass
 
+import orjson
 from kafka import KafkaConsumer, KafkaProducer
 from kafka.consumer.fetcher import ConsumerRecord
 from kafka.structs import OffsetAndMetadata, TopicPartition
@@ -12,8 +14,25 @@ from signs_dashboard.modules_config import ModulesConfig
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_POLL_RECORDS = 100
+BATCH_MAX_POLL_RECORDS = 500
+POLL_TIMEOUT_MS = 1000
 
-@dataclass
+PRODUCER_PROFILE_DURABLE = 'durable'
+PRODUCER_PROFILE_FAST = 'fast'
+PRODUCER_PROFILES = {
+    PRODUCER_PROFILE_DURABLE: {},
+    # user-triggered tasks: failures are visible to the user and the task can be restarted
+    PRODUCER_PROFILE_FAST: {
+        'acks': 1,
+        'retries': 0,
+    },
+}
+
+_ssl_contexts: dict[tuple[str, str, tp.Optional[str]], ssl.SSLContext] = {}
+
+
+@dataclass(frozen=True)
 class TopicNames:
     tracks: list[str]
     frames: list[str]
@@ -29,7 +48,7 @@ class TopicNames:
     cvat_upload: tp.Optional[str]
 
 
-@dataclass
+@dataclass(frozen=True)
 class ConsumerGroups:
     frames_saver: str
     track_metadata_saver: str
@@ -84,9 +103,10 @@ class KafkaService:
         self._consumer_params = {
             'auto_offset_reset': 'earliest',
             'enable_auto_commit': False,
-            'max_partition_fetch_bytes': 1857600,
-            'fetch_max_bytes': 1857600,
-            'max_poll_records': 100,
+            'max_partition_fetch_bytes': config.get('max_partition_fetch_bytes', 1857600),
+            'fetch_max_bytes': config.get('fetch_max_bytes', 1857600),
+            'fetch_min_bytes': config.get('fetch_min_bytes', 1),
+            'fetch_max_wait_ms': config.get('fetch_max_wait_ms', 500),
             'bootstrap_servers': config['bootstrap_servers'],
         }
         self._consumer_params.update(security_config)
@@ -96,9 +116,18 @@ class KafkaService:
             'retries': 3,
             'retry_backoff_ms': 1000,
             'acks': 'all',
+            'compression_type': config.get('producer_compression_type', 'lz4'),
+            # most sends wait for the result, lingering would delay each of them, batching callers opt in
+            'linger_ms': config.get('producer_linger_ms', 0),
+            'batch_size': config.get('producer_batch_size', 131072),
+            'max_in_flight_requests_per_connection': config.get('producer_max_in_flight_requests', 5),
         }
         self._producer_params.update(security_config)
+        # keyed like consumer_groups
+        self._max_poll_records = config.get('max_poll_records', {})
         self.producer_timeout_seconds = config.get('producer_timeout_seconds', 5)
+        self._producers: dict[tuple, KafkaProducer] = {}
+        self._producers_lock = threading.Lock()
 
     @property
     def topics(self) -> TopicNames:
@@ -111,65 +140,61 @@ class KafkaService:
         return self._modules_config.get_unified_predictions_topic()
 
     def get_tracks_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             *self._topics.tracks,
             group_id=self._groups.track_metadata_saver,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('track_metadata_saver', DEFAULT_MAX_POLL_RECORDS),
         )
 
     def get_video_frames_saver_consumer(self, consume_message_timeout_ms: float) -> KafkaConsumer:
-        consumer_params = dict(self._consumer_params)
-        consumer_params['max_poll_interval_ms'] = consume_message_timeout_ms
-        consumer_params['max_poll_records'] = 1
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.tracks_lifecycle,
             group_id=self._groups.video_frames_saver,
-            **consumer_params,
+            max_poll_records=1,
+            max_poll_interval_ms=consume_message_timeout_ms,
         )
 
     def get_detections_localizer_consumer(self, consume_message_timeout_ms: float) -> KafkaConsumer:
-        consumer_params = dict(self._consumer_params)
-        consumer_params['max_poll_interval_ms'] = consume_message_timeout_ms
-        consumer_params['max_poll_records'] = 1
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.tracks_lifecycle,
             group_id=self._groups.detections_localizer,
-            **consumer_params,
+            max_poll_records=1,
+            max_poll_interval_ms=consume_message_timeout_ms,
         )
 
     def get_logs_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             *self._topics.logs,
             group_id=self._groups.track_logs_saver,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('logs_saver', BATCH_MAX_POLL_RECORDS),
         )
 
     def get_frames_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             *self._topics.frames,
             group_id=self._groups.frames_saver,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('frames_saver', BATCH_MAX_POLL_RECORDS),
         )
 
     def get_predictions_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             *self._topics.prediction,
             group_id=self._groups.predictions_saver,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('predictions_saver', BATCH_MAX_POLL_RECORDS),
         )
 
     def get_camcom_frames_events_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.frames_lifecycle,
             group_id=self._groups.camcom_sender,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('camcom_sender', DEFAULT_MAX_POLL_RECORDS),
         )
 
     def get_map_matcher_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.tracks_lifecycle,
             group_id=self._groups.tracks_map_matcher,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('tracks_map_matcher', DEFAULT_MAX_POLL_RECORDS),
         )
 
     def get_pro_reporter_consumer(self) -> KafkaConsumer:
@@ -179,61 +204,99 @@ class KafkaService:
         ]
         if self._topics.objects_lifecycle:
             topics.append(self._topics.objects_lifecycle)
-        return KafkaConsumer(
+        return self._build_consumer(
             *topics,
             group_id=self._groups.reporter_pro,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('reporter_pro', DEFAULT_MAX_POLL_RECORDS),
         )
 
     def get_reload_tracks_consumer(self, consume_message_timeout_ms: int) -> KafkaConsumer:
-        reload_params = dict(self._consumer_params)
-        reload_params['max_poll_interval_ms'] = consume_message_timeout_ms
-        reload_params['max_poll_records'] = 1
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.tracks_reload,
             group_id=self._groups.tracks_reload,
-            **reload_params,
+            max_poll_records=1,
+            max_poll_interval_ms=consume_message_timeout_ms,
         )
 
     def get_cvat_uploader_consumer(self) -> KafkaConsumer:
-        return KafkaConsumer(
+        return self._build_consumer(
             self._topics.cvat_upload,
             group_id=self._groups.cvat_uploader,
-            **self._consumer_params,
+            max_poll_records=self._max_poll_records.get('cvat_uploader', DEFAULT_MAX_POLL_RECORDS),
         )
 
-    def get_producer(self, **kwargs) -> KafkaProducer:
-        logger.warning('Initializing kafka producer...')
-        kwargs = {
-            'value_serializer': lambda data: json.dumps(data).encode('utf-8'),
-            **kwargs,
-        }
-        return KafkaProducer(
-            **self._producer_params,
-            **kwargs,
-        )
+    def get_producer(self, profile: str = PRODUCER_PROFILE_DURABLE, **kwargs) -> KafkaProducer:
+        producer_key = (profile, *sorted(kwargs.items()))
+        with self._producers_lock:
+            producer = self._producers.get(producer_key)
+            if producer is None:
+                logger.warning(f'Initializing kafka producer with profile {profile}...')
+                producer = KafkaProducer(**{
+                    **self._producer_params,
+                    **PRODUCER_PROFILES[profile],
+                    'value_serializer': _json_serializer,
+                    **kwargs,
+                })
+                self._producers[producer_key] = producer
+        return producer
+
+    def _build_consumer(
+        self,
+        *topics: str,
+        group_id: str,
+        max_poll_records: int,
+        max_poll_interval_ms: tp.Optional[float] = None,
+    ) -> KafkaConsumer:
+        overrides = {'group_id': group_id, 'max_poll_records': max_poll_records}
+        if max_poll_interval_ms is not None:
+            overrides['max_poll_interval_ms'] = max_poll_interval_ms
+        return KafkaConsumer(*topics, **{**self._consumer_params, **overrides})
 
     def _prepare_security_config(self, config: dict) -> dict:
         if config.get('security_protocol', 'PLAINTEXT').upper() == 'SSL':
             if not (config.get('ssl_certfile') and config.get('ssl_keyfile')):
                 raise RuntimeError('invalid kafka.security config: missing ssl certificate PEM or ssl keyfile PEM')
 
-            ctx = ssl.create_default_context()
-            ctx.load_cert_chain(
-                certfile=config['ssl_certfile'],
-                keyfile=config['ssl_keyfile'],
-            )
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-
             return {
                 'security_protocol': 'SSL',
-                'ssl_context': ctx,
+                'ssl_context': _get_ssl_context(
+                    certfile=config['ssl_certfile'],
+                    keyfile=config['ssl_keyfile'],
+                    cafile=config.get('ssl_cafile'),
+                ),
             }
 
         return config
 
 
+def _get_ssl_context(certfile: str, keyfile: str, cafile: tp.Optional[str]) -> ssl.SSLContext:
+    context_key = (certfile, keyfile, cafile)
+    ctx = _ssl_contexts.get(context_key)
+    if ctx is not None:
+        return ctx
+
+    ctx = ssl.create_default_context(cafile=cafile)
+    ctx.load_cert_chain(
+        certfile=certfile,
+        keyfile=keyfile,
+    )
+    ctx.check_hostname = False
+    if not cafile:
+        logger.warning('Kafka SSL certificate verification is disabled: no ssl_cafile configured')
+        ctx.verify_mode = ssl.CERT_NONE
+
+    _ssl_contexts[context_key] = ctx
+    return ctx
+
+
+def utf8_serializer(value: str) -> bytes:
+    return value.encode('utf-8')
+
+
+def _json_serializer(data) -> bytes:
+    return orjson.dumps(data, default=str)
+
+
 def commit_single_message(consumer: KafkaConsumer, message: ConsumerRecord):
     partition, offset = message.partition, message.offset
     topic_partition = TopicPartition(message.topic, partition)
@@ -241,3 +304,22 @@ def commit_single_message(consumer: KafkaConsumer, message: ConsumerRecord):
         topic_partition: OffsetAndMetadata(offset=offset + 1, metadata=None),
     }
     consumer.commit(options)
+
+
+def poll_batches(consumer: KafkaConsumer, timeout_ms: int = POLL_TIMEOUT_MS) -> Iterator[list[ConsumerRecord]]:
+    while True:
+        records = consumer.poll(timeout_ms=timeout_ms)
+        messages = [message for partition_messages in records.values() for message in partition_messages]
+        if messages:
+            yield messages
+
+
+def commit_batch(consumer: KafkaConsumer, messages: list[ConsumerRecord]):
+    options: dict[TopicPartition, OffsetAndMetadata] = {}
+    for message in messages:
+        topic_partition = TopicPartition(message.topic, message.partition)
+        committed = options.get(topic_partition)
+        if committed is None or committed.offset <= message.offset:
+            options[topic_partition] = OffsetAndMetadata(offset=message.offset + 1, metadata=None)
+    if options:
+        consumer.commit(options)
@@ -1,11 +1,34 @@
+from datetime import datetime
+from operator import itemgetter
 from typing import Optional
+from xml.sax.saxutils import escape
 
-import simplekml
+from cachetools import TTLCache
 
 from signs_dashboard.models.track import Track
+from signs_dashboard.models.track_upload_status import TrackUploadStatus
 from signs_dashboard.query_params.tracks import TrackQueryParameters
 from signs_dashboard.services.tracks import TracksService
 
+KML_CACHE_SIZE = 32
+KML_CACHE_TTL_SEC = 10 * 60
+
+_kml_cache: TTLCache = TTLCache(maxsize=KML_CACHE_SIZE, ttl=KML_CACHE_TTL_SEC)
+
+# line colors are aabbggrr: green, yellow, red
+KML_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<kml xmlns="http://www.opengis.net/kml/2.2"><Document>'
+    '<Style id="good"><LineStyle><color>ff008000</color><width>10</width></LineStyle></Style>'
+    '<Style id="rejected"><LineStyle><color>ff00ffff</color><width>10</width></LineStyle></Style>'
+    '<Style id="failed"><LineStyle><color>ff0000ff</color><width>10</width></LineStyle></Style>'
+)
+KML_PLACEMARK_TEMPLATE = (
+    '<Placemark><name>{name}</name><styleUrl>#{style_id}</styleUrl>'
+    '<LineString><coordinates>{coords}</coordinates></LineString></Placemark>'
+)
+KML_FOOTER = '</Document></kml>'
+
 
 class KMLGeneratorService:
     def __init__(self, tracks_service: TracksService):
@@ -18,35 +41,59 @@ class KMLGeneratorService:
 
     def get_kml_from_email_and_date(self, query_params: TrackQueryParameters, fiji_enabled: bool) -> str:
         tracks = self._tracks_service.find_tracks_by_query_params(query_params)
-        points = {track.uuid: self._get_gps_points(track.uuid) for track in tracks}
-        return _add_gps_tracks_to_kml(tracks, points, fiji_enabled=fiji_enabled)
+        track_uuids = [track.uuid for track in tracks]
+        upload_statuses = self._tracks_service.get_upload_statuses(track_uuids, with_gps_points=False)
+        cache_key = (
+            fiji_enabled,
+            tuple(
+                (track.uuid, track.fiji_status, _get_gps_version(upload_statuses.get(track.uuid)))
+                for track in tracks
+            ),
+        )
+        kml = _kml_cache.get(cache_key)
+        if kml is None:
+            upload_statuses = self._tracks_service.get_upload_statuses(track_uuids)
+            points = {track.uuid: _get_gps_points(upload_statuses.get(track.uuid)) for track in tracks}
+            kml = _add_gps_tracks_to_kml(tracks, points, fiji_enabled=fiji_enabled)
+            _kml_cache[cache_key] = kml
+        return kml
 
-    def _get_gps_points(self, track_uuid: str) -> Optional[list[dict]]:
-        upload_status = self._tracks_service.get_upload_status(track_uuid)
-        if upload_status:
-            return upload_status.gps_points
-        return None
 
+def _get_gps_points(upload_status: Optional[TrackUploadStatus]) -> Optional[list[dict]]:
+    if upload_status:
+        return upload_status.gps_points
+    return None
 
-def _add_gps_tracks_to_kml(tracks: list[Track], points: dict[str, list], fiji_enabled: bool):
-    kml = simplekml.Kml()
 
-    for track in tracks:
-        track_coords = [
-            (point.get('Longitude') or point.get('longitude'), point.get('Latitude') or point.get('latitude'))
-            for point in points[track.uuid] or []
-        ]
-        ls = kml.newlinestring(coords=track_coords)
+def _get_gps_version(upload_status: Optional[TrackUploadStatus]) -> Optional[datetime]:
+    if upload_status:
+        return upload_status.gps_time
+    return None
+
 
+def _add_gps_tracks_to_kml(tracks: list[Track], points: dict[str, list], fiji_enabled: bool) -> str:
+    kml_parts = [KML_HEADER]
+
+    for track in tracks:
         if track.is_fiji_good_status() or not fiji_enabled:
-            ls.style.linestyle.color = simplekml.Color.green
-            ls.name = track.uuid
+            style_id, name = 'good', track.uuid
         elif track.is_fiji_rejected_status():
-            ls.style.linestyle.color = simplekml.Color.yellow
-            ls.name = '{uuid} ({status})'.format(uuid=track.uuid, status='rejected')
+            style_id, name = 'rejected', '{uuid} ({status})'.format(uuid=track.uuid, status='rejected')
         else:
-            ls.style.linestyle.color = simplekml.Color.red
-            ls.name = '{uuid} ({status})'.format(uuid=track.uuid, status='failed')
-        ls.style.linestyle.width = 10
+            style_id, name = 'failed', '{uuid} ({status})'.format(uuid=track.uuid, status='failed')
+
+        coords = ' '.join(f'{lon},{lat}' for lon, lat in _get_track_coords(points[track.uuid] or []))
+        kml_parts.append(KML_PLACEMARK_TEMPLATE.format(name=escape(name), style_id=style_id, coords=coords))
+
+    kml_parts.append(KML_FOOTER)
+    return ''.join(kml_parts)
+
 
-    return kml.kml()
+def _get_track_coords(track_points: list[dict]) -> list[tuple[float, float]]:
+    if not track_points:
+        return []
+    if 'Longitude' in track_points[0]:
+        coords_getter = itemgetter('Longitude', 'Latitude')
+    else:
+        coords_getter = itemgetter('longitude', 'latitude')
+    return list(map(coords_getter, track_points))
@@ -1,8 +1,9 @@
 import logging
 import typing as tp
 
+import msgspec
+import orjson
 import requests
-from pydantic import BaseModel, Extra
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 from yarl import URL
@@ -17,14 +18,20 @@ logger = logging.getLogger(__name__)
 UNAVAILABLE_CODES = (403, 501, 502, 503)
 UNABLE_TO_MATCH_CODES = (204, 400, 422)
 RETRY_CODES = (501, 502, 503)
+JSON_HEADERS = {'Content-Type': 'application/json'}
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
 
 
-class MapMatchingResult(BaseModel):
+class MapMatchingResult(msgspec.Struct):
     distance: float
     query: list[dict]
 
-    class Config:
-        extra = Extra.ignore
+
+class _MapMatchingResponse(msgspec.Struct):
+    status: tp.Optional[str] = None
+    distance: tp.Optional[float] = None
+    query: tp.Optional[list[dict]] = None
 
 
 class MapMatchingAPIClient:
@@ -33,9 +40,14 @@ class MapMatchingAPIClient:
         if map_matching_config is None:
             map_matching_config = {}
         self.host = map_matching_config.get('host')
+        self._key = map_matching_config.get('key')
+        self._match_url = None
+        self._match_request_url = None
         if self.host:
             self.host = URL(self.host)
-        self._key = map_matching_config.get('key')
+            match_url = self.host / 'map_matching' / '1.0.0'
+            self._match_url = str(match_url)
+            self._match_request_url = str(match_url.with_query(key=self._key)) if self._key else self._match_url
         self._verify_ssl = map_matching_config.get('verify_ssl')
 
         self._timeout = map_matching_config.get('timeout') or 10
@@ -44,19 +56,25 @@ class MapMatchingAPIClient:
             backoff_factor=map_matching_config.get('retries_backoff_factor') or 0,
             status_forcelist=RETRY_CODES,
         )
+        adapter = HTTPAdapter(
+            max_retries=retries,
+            pool_connections=map_matching_config.get('pool_connections') or POOL_CONNECTIONS,
+            pool_maxsize=map_matching_config.get('pool_maxsize') or POOL_MAXSIZE,
+            pool_block=False,
+        )
         self._session = requests.Session()
-        self._session.mount('http://', HTTPAdapter(max_retries=retries))
-        self._session.mount('https://', HTTPAdapter(max_retries=retries))
+        self._session.headers['Connection'] = 'keep-alive'
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
 
     def match(self, gps_points: list[dict], track: Track) -> MapMatchingResult:
-        url = self.host / 'map_matching' / '1.0.0'
-        params = {'key': self._key}
+        gps_points_json = orjson.dumps(gps_points)
         with MapMatchingLoggingService(self._s3_service, track=track) as mm_logging:
-            mm_logging.save_input(gps_points=gps_points, url=str(url))
+            mm_logging.save_input(gps_points=gps_points, gps_points_json=gps_points_json, url=self._match_url)
             response = self._session.post(
-                url,
-                params=params,
-                json={'query': gps_points},
+                self._match_request_url,
+                data=b''.join((b'{"query":', gps_points_json, b'}')),
+                headers=JSON_HEADERS,
                 timeout=self._timeout,
                 verify=self._verify_ssl,
             )
@@ -81,19 +99,20 @@ class MapMatchingAPIClient:
             raise MapMatchingUnavailableError(f"Unexpected status code: {response.status_code}: '{response.text}'")
 
         try:
-            resp = response.json()
+            resp = msgspec.json.decode(response.content, type=_MapMatchingResponse)
+        except msgspec.ValidationError as exc:
+            raise UnableToMatchTrackError(f"Unable to parse response: {exc}: '{response.text}'")
         except Exception:
             raise MapMatchingUnavailableError(f"Unexpected response: {response.status_code}: '{response.text}'")
 
         logger.debug(f'Map matching results {resp}')
 
-        if resp.get('status') != 'OK':
-            raise UnableToMatchTrackError(f'Unable to match track: {resp}')
+        if resp.status != 'OK':
+            raise UnableToMatchTrackError(f"Unable to match track: '{response.text}'")
 
-        return self._parse_response(resp)
+        return self._parse_response(resp, response_text=response.text)
 
-    def _parse_response(self, resp: dict) -> MapMatchingResult:
-        try:
-            return MapMatchingResult.parse_obj(resp)
-        except Exception as exc:
-            raise UnableToMatchTrackError(f'Unable to parse response: {exc}: {resp}')
+    def _parse_response(self, resp: _MapMatchingResponse, response_text: str) -> MapMatchingResult:
+        if resp.distance is None or resp.query is None:
+            raise UnableToMatchTrackError(f"Unable to parse response: missing distance or query: '{response_text}'")
+        return MapMatchingResult(distance=resp.distance, query=resp.query)
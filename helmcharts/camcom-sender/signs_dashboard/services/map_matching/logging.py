@@ -1,27 +1,41 @@
-import json
+import gzip
 import logging
+import math
 import os
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime
-from io import BytesIO, TextIOWrapper
+from functools import cached_property
+from io import BytesIO
+
+import orjson
 
 from signs_dashboard.models.track import Track
 from signs_dashboard.services.s3_service import S3Service
 
 logger = logging.getLogger(__name__)
 
-LOG_MAP_MATCHING_INPUT_OUTPUT = os.environ.get('LOG_MAP_MATCHING_INPUT_OUTPUT', True)
+LOG_MAP_MATCHING_INPUT_OUTPUT = os.environ.get('LOG_MAP_MATCHING_INPUT_OUTPUT', 'true').lower() in {'1', 'true', 'yes'}
+UPLOAD_WORKERS = 4
+ERROR_UPLOAD_TIMEOUT_SEC = 5
+MAX_LOGGED_POINTS = 2000
 
 
 class MapMatchingLoggingService:
+    _upload_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix='map_matching_logs')
 
     def __init__(self, s3_service: S3Service, track: Track):
         self._s3_service = s3_service
         self._prefix = 'map_matching_'
         self.run_id = datetime.now().isoformat()
-        self.bucket = self._s3_service.buckets.get_log_bucket(track.uploaded or track.recorded)
         self.track_uuid = track.uuid
         self.enabled = LOG_MAP_MATCHING_INPUT_OUTPUT
+        self._track_date = track.uploaded or track.recorded
+        self._upload_futures: list[Future] = []
+
+    @cached_property
+    def bucket(self) -> str:
+        return self._s3_service.buckets.get_log_bucket(self._track_date)
 
     def __enter__(self):
         return self
@@ -35,19 +49,27 @@ class MapMatchingLoggingService:
                 'exc_val': str(exc_val),
             }
             self._upload_json(data, filename)
+            wait(self._upload_futures, timeout=ERROR_UPLOAD_TIMEOUT_SEC)
         return False
 
-    def save_input(self, gps_points: list[dict], url: str):
+    def save_input(self, gps_points: list[dict], gps_points_json: bytes, url: str):
         if not self.enabled:
             return
 
         filename = f'{self._prefix}_{self.run_id}_input.json'
-        logger.info(f'Saving input to {filename}')
-        data = {
-            'gps_points': gps_points,
-            'url': url,
-        }
-        self._upload_json(data, filename)
+        logger.info(f'Saving input to {filename}, {len(gps_points)} gps points')
+        if len(gps_points) > MAX_LOGGED_POINTS:
+            gps_points_json = orjson.dumps(_sample_points(gps_points, MAX_LOGGED_POINTS))
+        payload = b''.join((
+            b'{"gps_points":',
+            gps_points_json,
+            b',"gps_points_total":',
+            str(len(gps_points)).encode(),
+            b',"url":',
+            orjson.dumps(url),
+            b'}',
+        ))
+        self._upload_payload(payload, filename)
 
     def save_output(
         self,
@@ -68,13 +90,37 @@ class MapMatchingLoggingService:
         self._upload_json(data, filename)
 
     def _upload_json(self, data: dict, filename: str):
-        buffer = BytesIO()
-        text_buffer = TextIOWrapper(buffer, encoding='utf-8')
-        json.dump(data, text_buffer)
-        text_buffer.seek(0)
-        self._s3_service.upload_fileobj(
+        self._upload_payload(orjson.dumps(data, default=str), filename)
+
+    def _upload_payload(self, payload: bytes, filename: str):
+        future = self._upload_executor.submit(
+            self._upload_bytes,
+            payload=payload,
             bucket=self.bucket,
             key=f'{self.track_uuid}/{filename}',
+        )
+        future.add_done_callback(_log_upload_error)
+        self._upload_futures.append(future)
+
+    def _upload_bytes(self, payload: bytes, bucket: str, key: str):
+        self._s3_service.upload_fileobj(
+            bucket=bucket,
+            key=key,
             content_type='application/json',
-            fileobj=buffer,
+            fileobj=BytesIO(gzip.compress(payload)),
+            extra_args={'ContentEncoding': 'gzip'},
         )
+
+
+def _sample_points(gps_points: list[dict], max_points: int) -> list[dict]:
+    step = math.ceil(len(gps_points) / max_points)
+    sampled = gps_points[::step]
+    if sampled[-1] is not gps_points[-1]:
+        sampled.append(gps_points[-1])
+    return sampled
+
+
+def _log_upload_error(future: Future):
+    exc = future.exception()
+    if exc:
+        logger.error(f'Unable to upload map matching log: {exc}')
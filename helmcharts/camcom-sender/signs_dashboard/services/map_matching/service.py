@@ -1,9 +1,11 @@
 import logging
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from itertools import groupby
-from operator import attrgetter, itemgetter
+from operator import itemgetter
 from typing import Optional
 
+import numpy as np
+
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.models.track import Track
 from signs_dashboard.services.frames import FramesService
@@ -58,7 +60,7 @@ class MapMatchingService:
     def match_track(self, track: Track):
         logger.info(f'Map matching track {track.uuid}, track has {len(track.upload.gps_points)} raw gps points')
 
-        frames = sorted(self._frames_service.get_by_track(track), key=attrgetter('timestamp'))
+        frames = self._frames_service.get_by_track(track, order_by_date=True)
         if not frames:
             raise UnableToMatchTrackError(f'Track {track.uuid} has no frames')
 
@@ -71,21 +73,9 @@ class MapMatchingService:
         track.upload.matched_gps_points = match_result.matched_points
         self._tracks_service.save_upload_status(track.upload)
 
-        points_mapping = {
-            mpoint['timestamp']: mpoint
-            for mpoint in match_result.matched_points
-        }
-
-        for frame in frames:
-            point = points_mapping.get(frame.timestamp)
-            if not point:
-                raise UnableToMatchTrackError(
-                    f'Frame {frame.id} was not matched - frame point missing from map matching results',
-                )
-            frame.matched_lat = correct_round(point['latitude'])
-            frame.matched_lon = correct_round(point['longitude'])
-            self._frames_service.save(frame)
-            self._interest_zones_service.update_frame_interest_zones(frame)
+        self._set_frames_matched_coords(frames, match_result.matched_points)
+        self._frames_service.bulk_update_matched_coords(frames)
+        self._interest_zones_service.update_frames_interest_zones(frames)
 
         self._tracks_service.set_track_recorded_time_and_distance(
             track.uuid,
@@ -94,6 +84,22 @@ class MapMatchingService:
         )
         return frames
 
+    def _set_frames_matched_coords(self, frames: list[Frame], matched_points: list[dict]):
+        # frames are sorted by timestamp, so walk them together with sorted matched points
+        matched_points = sorted(matched_points, key=itemgetter('timestamp'))
+        point_idx = 0
+        for frame in frames:
+            # last matched point with timestamp <= frame timestamp
+            while point_idx < len(matched_points) and matched_points[point_idx]['timestamp'] <= frame.timestamp:
+                point_idx += 1
+            point = matched_points[point_idx - 1] if point_idx else None
+            if not point or point['timestamp'] != frame.timestamp:
+                raise UnableToMatchTrackError(
+                    f'Frame {frame.id} was not matched - frame point missing from map matching results',
+                )
+            frame.matched_lat = correct_round(point['latitude'])
+            frame.matched_lon = correct_round(point['longitude'])
+
     def _match(self, gps_points: list[dict], track: Track) -> TrackMapMatchingResult:
         batch_size = 1000
         if len(gps_points) > 1000:
@@ -110,7 +116,9 @@ class MapMatchingService:
         return matched
 
     def _get_points_for_matching(self, track: Track, frames: list[Frame]) -> list[dict]:
-        points = self._select_gps_points_between_frames(None, frames[0], track.upload.gps_points)
+        gps_points = sorted(track.upload.gps_points, key=itemgetter('timestamp'))
+        gps_timestamps = [gps_point['timestamp'] for gps_point in gps_points]
+        points = self._select_gps_points_between_frames(None, frames[0], gps_points, gps_timestamps)
 
         for idx, current_frame in enumerate(frames):
             points.append(self._match_point_from_frame(current_frame))
@@ -119,43 +127,50 @@ class MapMatchingService:
 
             next_frame = frames[idx + 1]
             if current_frame.timestamp - next_frame.timestamp > FRAMES_TIMESTAMP_MAX_DIFF_MS:
-                points += self._select_gps_points_between_frames(current_frame, next_frame, track.upload.gps_points)
+                points += self._select_gps_points_between_frames(
+                    current_frame,
+                    next_frame,
+                    gps_points,
+                    gps_timestamps,
+                )
 
-        points += self._select_gps_points_between_frames(frames[-1], None, track.upload.gps_points)
+        points += self._select_gps_points_between_frames(frames[-1], None, gps_points, gps_timestamps)
         return points
 
     def _interpolate_missing_points(self, points: list[dict]) -> list[dict]:
-        resulting_points = []
-        for idx, current_point in enumerate(points):
-            resulting_points.append(current_point)
-            if idx == len(points) - 1:
-                continue
+        utc = np.fromiter((point['utc'] for point in points), dtype=np.float64, count=len(points))
+        ts_diffs = np.diff(utc)
+        gaps_indices = np.flatnonzero(ts_diffs > FRAMES_TIMESTAMP_MAX_DIFF_SEC)
 
-            next_point = points[idx + 1]
-            ts_diff = next_point['utc'] - current_point['utc']
-            if ts_diff > FRAMES_TIMESTAMP_MAX_DIFF_SEC:
-                logger.debug(f'Too big time difference between points: {current_point} ({idx=}), {next_point}')
-                resulting_points += self._gps_interpolation_service.interpolate_mm_points(
-                    point1=current_point,
-                    point2=next_point,
-                    intermediate_points=int(ts_diff // INTERPOLATED_GPS_POINTS_INTERVAL_SEC) + 1,
-                )
+        resulting_points = []
+        span_start = 0
+        for idx in gaps_indices.tolist():
+            current_point, next_point = points[idx], points[idx + 1]
+            resulting_points += points[span_start:idx + 1]
+            logger.debug(f'Too big time difference between points: {current_point} ({idx=}), {next_point}')
+            resulting_points += self._gps_interpolation_service.interpolate_mm_points(
+                point1=current_point,
+                point2=next_point,
+                intermediate_points=int(ts_diffs[idx] // INTERPOLATED_GPS_POINTS_INTERVAL_SEC) + 1,
+            )
+            span_start = idx + 1
+        resulting_points += points[span_start:]
         return resulting_points
 
-    def _select_gps_points_between_frames(  # noqa: WPS231
+    def _select_gps_points_between_frames(
         self,
         frame1: Optional[Frame],
         frame2: Optional[Frame],
         gps_points: list[dict],
+        gps_timestamps: list[int],
     ) -> list[dict]:
-        points = []
-        for gps_point in gps_points:
-            if frame1 and gps_point['timestamp'] < frame1.timestamp:
-                continue
-            if frame2 and gps_point['timestamp'] > frame2.timestamp:
-                continue
-            points.append(self._match_point_from_gps_point(gps_point))
-        return points
+        # gps_points are sorted by timestamp, so points between frames form a contiguous slice
+        start = bisect_left(gps_timestamps, frame1.timestamp) if frame1 else 0
+        end = bisect_right(gps_timestamps, frame2.timestamp) if frame2 else len(gps_timestamps)
+        return [
+            self._match_point_from_gps_point(gps_point)
+            for gps_point in gps_points[start:end]
+        ]
 
     def _match_point_from_gps_point(self, point: dict) -> dict:
         return {
@@ -205,7 +220,7 @@ class LegacyMapMatchingService(MapMatchingService):
             distance_km=self._track_length_service.calculate_length_km(match_result.matched_points),
         )
 
-        frames = self._frames_service.get_by_track(track)
+        frames = self._frames_service.get_by_track(track, order_by_date=True)
         for frame in frames:
             frame_point = self._gps_interpolation_service.interpolate_frame_point(
                 frame.timestamp,
@@ -214,8 +229,8 @@ class LegacyMapMatchingService(MapMatchingService):
             lat, lon = frame_point['latitude'], frame_point['longitude']
             frame.matched_lat = correct_round(lat)
             frame.matched_lon = correct_round(lon)
-            self._frames_service.save(frame)
-            self._interest_zones_service.update_frame_interest_zones(frame)
+        self._frames_service.bulk_update_matched_coords(frames)
+        self._interest_zones_service.update_frames_interest_zones(frames)
 
         return frames
 
@@ -238,15 +253,14 @@ class LegacyMapMatchingService(MapMatchingService):
                 interpolated_points.append(gps_point)
             last_gps_point = gps_point
 
-        timestamp_key = itemgetter('timestamp')
-        group_by_seconds = groupby(sorted(interpolated_points, key=timestamp_seconds_key), key=timestamp_seconds_key)
-        return sorted(
-            [
-                min(group, key=timestamp_key)
-                for _, group in group_by_seconds
-            ],
-            key=timestamp_key,
-        )
+        # keep the earliest point of every second
+        points_by_second: dict[int, dict] = {}
+        for point in interpolated_points:
+            second = timestamp_seconds_key(point)
+            earliest_point = points_by_second.get(second)
+            if earliest_point is None or point['timestamp'] < earliest_point['timestamp']:
+                points_by_second[second] = point
+        return [points_by_second[second] for second in sorted(points_by_second)]
 
     def _match_via_api(self, gps_points: list[dict], track: Track) -> MapMatchingResult:
         points = [
@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 from functools import lru_cache
 
@@ -17,19 +18,11 @@ class CropsParams:
     PIXEL_SIZE_Y = 0.05
     SEAM_THETA: int = 180
     CROPS_Z_POSITIONS: tuple[int] = (0, 90, SEAM_THETA, 270)
-
-    @classmethod
-    @property
-    def crop_size(cls) -> tuple[int, int]:
-        """
-        Calculate dimensions for the perspective image
-
-        Returns:
-            Width and height for perspective image.
-        """
-        wd = int(2 * np.tan(np.radians(cls.FOV_X / 2.0)) * cls.SCALE_FACTOR)
-        hd = int(2 * np.tan(np.radians(cls.FOV_Y / 2.0)) * cls.SCALE_FACTOR)
-        return wd, hd
+    # Dimensions of the perspective image, calculated once on class definition
+    crop_size = (
+        int(2 * math.tan(math.radians(FOV_X / 2.0)) * SCALE_FACTOR),
+        int(2 * math.tan(math.radians(FOV_Y / 2.0)) * SCALE_FACTOR),
+    )
 
 
 @lru_cache
@@ -76,3 +69,22 @@ def calculate_equirectal_params(
     R2, _ = cv2.Rodrigues(np.dot(R1, y_axis) * np.radians(-phi))
 
     return wd, hd, R1, R2, c_x, c_y, w_interval, h_interval
+
+
+@lru_cache
+def calculate_equirectal_rotation(theta: float) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate combined rotation matrix and its inverse for projection kernels.
+
+    Args:
+        theta: Rotation around the Z-axis in degrees.
+
+    Returns:
+        Contiguous float64 rotation matrix and inverse rotation matrix.
+    """
+    _, _, R1, R2, *_ = calculate_equirectal_params(theta=theta)
+    # Prepare the combined rotation matrix
+    R = np.ascontiguousarray(np.dot(R2, R1), dtype=np.float64)
+    # Rotation matrix is orthogonal, so its inverse is the transpose
+    R_inv = np.ascontiguousarray(R.T)
+    return R, R_inv
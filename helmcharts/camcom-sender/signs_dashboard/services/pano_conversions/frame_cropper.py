@@ -1,25 +1,38 @@
-import gc
-import io
 import logging
 import os
+import struct
 import time
+import typing as tp
 from concurrent.futures import ThreadPoolExecutor, wait
 
 import cv2
 import numpy as np
 import piexif
+from turbojpeg import TJSAMP_420, TurboJPEG
 
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.services.image import ImageService
 from signs_dashboard.services.pano_conversions.common import CropsParams
-from signs_dashboard.services.pano_conversions.from_equirectangular import equirectal_image_to_perspective_crop
+from signs_dashboard.services.pano_conversions.from_equirectangular import (
+    crop_remap_params,
+    equirectal_image_to_perspective_crop,
+    perspective_focal_lengths,
+)
 from signs_dashboard.services.s3_client import S3ClientService
 from signs_dashboard.services.s3_keys import S3KeysService
 from signs_dashboard.services.s3_service import S3Service
 
 image_service: ImageService = None
 s3_executor: ThreadPoolExecutor = None
+turbo_jpeg: tp.Optional[TurboJPEG] = None
 CAMERA_ROTATION_ANGLE = 0
+JPEG_APP0_MARKER = b'\xff\xe0'
+JPEG_APP1_MARKER = b'\xff\xe1'
+MAX_JPEG_SEGMENT_LENGTH = 0xFFFF
+JPEG_QUALITY = 95  # same as cv2.imencode default
+stacked_remap_lut: tp.Optional[tuple[np.ndarray, np.ndarray, int, int]] = None
+# reused between frames: generate_crops_from_frame waits for crops uploads before returning
+stacked_crops_buffer: tp.Optional[np.ndarray] = None
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +40,9 @@ logger = logging.getLogger(__name__)
 def initialize_cropping_worker(s3_config: dict):
     global image_service  # pylint: disable=W0603
     global s3_executor  # pylint: disable=W0603
+    global turbo_jpeg  # pylint: disable=W0603
+    global stacked_remap_lut  # pylint: disable=W0603
+    global stacked_crops_buffer  # pylint: disable=W0603
     image_service = ImageService(
         s3_service=S3Service(
             s3_client=S3ClientService(s3_config=s3_config),
@@ -35,6 +51,12 @@ def initialize_cropping_worker(s3_config: dict):
         ),
     )
     s3_executor = ThreadPoolExecutor(max_workers=s3_config.get('executor_max_workers', 10))
+    try:
+        turbo_jpeg = TurboJPEG()
+    except (OSError, RuntimeError) as exc:
+        logger.warning(f'libjpeg-turbo is unavailable, falling back to OpenCV JPEG codec: {exc}')
+    stacked_remap_lut = _build_stacked_remap_lut()
+    stacked_crops_buffer = np.empty((*stacked_remap_lut[0].shape[:2], 3), np.uint8)
 
 
 def generate_crops_from_frame(  # noqa: WPS210
@@ -43,55 +65,129 @@ def generate_crops_from_frame(  # noqa: WPS210
     image_path: str,
 ) -> bool:
     t1 = time.monotonic()
-    with open(image_path, 'rb') as file:
-        img = file.read()
-
     futures = []
-    np_image = cv2.imdecode(np.frombuffer(img, np.uint8), cv2.IMREAD_COLOR)
-    for theta in CropsParams.CROPS_Z_POSITIONS:
-        crop, focal_length_x, focal_length_y = equirectal_image_to_perspective_crop(
-            img=np_image,
-            theta=theta + CAMERA_ROTATION_ANGLE,
-        )
-
-        success, crop_bytes = cv2.imencode('.jpg', crop)
-        if success:
-            crop_with_exif = _update_crop_exif(
-                crop_bytes=crop_bytes.tobytes(),
-                source_image_bytes=img,
-                source_azimuth=source_azimuth,
-                theta=theta,
-                focal_length_x=focal_length_x,
-                focal_length_y=focal_length_y,
-                image_width=np_image.shape[1],
-                image_height=np_image.shape[0],
-            )
-            futures.append(s3_executor.submit(
-                image_service.upload_frame,
-                frame=frame,
-                image=crop_with_exif,
-                theta=theta,
-            ))
-        else:
-            raise RuntimeError(
-                f'Could crop with theta {theta} for frame from track {frame.track_uuid} @ {frame.date}',
-            )
+    np_image, source_exif = _read_image(image_path)
+    crops = _crop_equirectal_image(np_image)
+    for theta, (crop, focal_length_x, focal_length_y) in zip(CropsParams.CROPS_Z_POSITIONS, crops):
+        futures.append(s3_executor.submit(
+            _encode_and_upload_crop,
+            crop=crop,
+            frame=frame,
+            source_exif=source_exif,
+            source_azimuth=source_azimuth,
+            theta=theta,
+            focal_length_x=focal_length_x,
+            focal_length_y=focal_length_y,
+            image_width=np_image.shape[1],
+            image_height=np_image.shape[0],
+        ))
 
     t2 = time.monotonic()
 
     wait(futures)
+    for future in futures:
+        # re-raises encoding and upload errors, source image is kept for retry
+        future.result()
 
     t3 = time.monotonic()
 
     logger.debug(f'Spend {t2 - t1:.4f}s cropping , {t3 - t2:.4f}s waiting for upload')  # noqa: E501
     os.remove(image_path)
-    gc.collect()
     return True
 
 
+def _build_stacked_remap_lut() -> tuple[np.ndarray, np.ndarray, int, int]:
+    """
+    Stacks remap maps of all crops vertically, so single cv2.remap call produces all crops at once.
+
+    Returns:
+        Stacked fixed-point remap maps and single crop dimensions.
+    """
+    maps1, maps2 = [], []
+    for theta in CropsParams.CROPS_Z_POSITIONS:
+        # bypass lru_cache, cached maps would duplicate the stacked ones in memory
+        map1, map2, wd, hd = crop_remap_params.__wrapped__(
+            theta=theta + CAMERA_ROTATION_ANGLE,
+            equ_h=CropsParams.VIDEO360_HEIGHT,
+            equ_w=CropsParams.VIDEO360_WIDTH,
+        )
+        maps1.append(map1)
+        maps2.append(map2)
+    return np.vstack(maps1), np.vstack(maps2), wd, hd
+
+
+def _crop_equirectal_image(np_image: np.ndarray) -> list[tuple[np.ndarray, float, float]]:
+    is_default_size = np_image.shape[:2] == (CropsParams.VIDEO360_HEIGHT, CropsParams.VIDEO360_WIDTH)
+    if stacked_remap_lut is None or not is_default_size:
+        return [
+            equirectal_image_to_perspective_crop(img=np_image, theta=theta + CAMERA_ROTATION_ANGLE)
+            for theta in CropsParams.CROPS_Z_POSITIONS
+        ]
+
+    map1, map2, wd, hd = stacked_remap_lut
+    stacked_crops = cv2.remap(
+        np_image,
+        map1,
+        map2,
+        cv2.INTER_CUBIC,
+        dst=stacked_crops_buffer,
+        borderMode=cv2.BORDER_WRAP,
+    )
+    focal_length_x, focal_length_y = perspective_focal_lengths(wd=wd, hd=hd)
+    return [
+        (crop, focal_length_x, focal_length_y)
+        for crop in np.split(stacked_crops, len(CropsParams.CROPS_Z_POSITIONS))
+    ]
+
+
+def _read_image(image_path: str) -> tuple[np.ndarray, dict]:
+    # compressed image bytes are dropped on return, before crops are allocated
+    if turbo_jpeg is None:
+        return cv2.imread(image_path, cv2.IMREAD_COLOR), piexif.load(image_path)
+    with open(image_path, 'rb') as file:
+        image = file.read()
+    return turbo_jpeg.decode(image), piexif.load(image)
+
+
+def _encode_jpeg(image: np.ndarray) -> tp.Optional[bytes]:
+    if turbo_jpeg is not None:
+        return turbo_jpeg.encode(image, quality=JPEG_QUALITY, jpeg_subsample=TJSAMP_420)
+    success, image_bytes = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+    return image_bytes.tobytes() if success else None
+
+
+def _encode_and_upload_crop(  # noqa: WPS211
+    crop: np.ndarray,
+    frame: Frame,
+    source_exif: dict,
+    source_azimuth: float,
+    theta: float,
+    focal_length_x: float,
+    focal_length_y: float,
+    image_width: int,
+    image_height: int,
+):
+    crop_bytes = _encode_jpeg(crop)
+    if crop_bytes is None:
+        raise RuntimeError(
+            f'Could crop with theta {theta} for frame from track {frame.track_uuid} @ {frame.date}',
+        )
+    crop_with_exif = _update_crop_exif(
+        crop_bytes=crop_bytes,
+        source_exif=source_exif,
+        source_azimuth=source_azimuth,
+        theta=theta,
+        focal_length_x=focal_length_x,
+        focal_length_y=focal_length_y,
+        image_width=image_width,
+        image_height=image_height,
+    )
+    image_service.upload_frame(frame=frame, image=crop_with_exif, theta=theta)
+
+
 def _update_crop_exif(
     crop_bytes: bytes,
-    source_image_bytes: bytes,
+    source_exif: dict,
     source_azimuth: float,
     theta: float,
     focal_length_x: float,
@@ -99,7 +195,12 @@ def _update_crop_exif(
     image_width: int,
     image_height: int,
 ) -> bytes:
-    exif_dict = piexif.load(source_image_bytes)
+    # source exif is shared between crops, copy only IFDs modified below
+    exif_dict = {
+        **source_exif,
+        'GPS': dict(source_exif['GPS']),
+        'Exif': dict(source_exif['Exif']),
+    }
     azimuth = source_azimuth + theta
     focal_length_x_mm = focal_length_x * CropsParams.PIXEL_SIZE_X
     focal_length_y_mm = focal_length_y * CropsParams.PIXEL_SIZE_Y  # noqa: F841 - NOT USED
@@ -114,11 +215,34 @@ def _update_crop_exif(
     exif_dict['Exif'][piexif.ExifIFD.FocalPlaneYResolution] = _as_fraction(sensor_height_mm, precision=2)
 
     exif_bytes = piexif.dump(exif_dict)
-
-    crop_img_byte_arr = io.BytesIO()
-    piexif.insert(exif_bytes, crop_bytes, crop_img_byte_arr)
-    crop_img_byte_arr.seek(0)
-    return crop_img_byte_arr.read()
+    return _insert_exif_segment(crop_bytes, exif_bytes)
+
+
+def _insert_exif_segment(jpeg_bytes: bytes, exif_bytes: bytes) -> bytes:
+    """
+    Inserts APP1 Exif segment right after SOI marker, replacing JFIF APP0 segment like piexif.insert does.
+
+    Args:
+        jpeg_bytes: JPEG image without Exif, as produced by encoder.
+        exif_bytes: Exif data from piexif.dump.
+
+    Returns:
+        JPEG image with Exif.
+    """
+    segment_length = len(exif_bytes) + 2
+    if segment_length > MAX_JPEG_SEGMENT_LENGTH:
+        raise ValueError(f'Exif is too large: {segment_length} bytes')
+
+    body_start = 2
+    if jpeg_bytes[2:4] == JPEG_APP0_MARKER:
+        body_start = 4 + struct.unpack('>H', jpeg_bytes[4:6])[0]
+    return b''.join((
+        jpeg_bytes[:2],
+        JPEG_APP1_MARKER,
+        struct.pack('>H', segment_length),
+        exif_bytes,
+        jpeg_bytes[body_start:],
+    ))
 
 
 def _as_fraction(num: float, precision: int) -> tuple[int, int]:
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True)
+def perspective_to_equirectal_kernel(  # noqa: WPS211
+    coords: np.ndarray,
+    R: np.ndarray,
+    c_x: float,
+    c_y: float,
+    w_interval: float,
+    h_interval: float,
+    equ_cx: float,
+    equ_cy: float,
+) -> np.ndarray:
+    """
+    Projects (N, 2) perspective image coordinates to equirectangular image.
+
+    Returns:
+        (N, 2) int64 array of equirectangular image coordinates.
+    """
+    mapped = np.empty((coords.shape[0], 2), np.int64)
+    for idx in range(coords.shape[0]):
+        y_map = (coords[idx, 0] - c_x) * w_interval
+        z_map = -(coords[idx, 1] - c_y) * h_interval
+        distance = math.sqrt(1.0 + y_map * y_map + z_map * z_map)
+        x = 1.0 / distance
+        y = y_map / distance
+        z = z_map / distance
+
+        x_rot = R[0, 0] * x + R[0, 1] * y + R[0, 2] * z
+        y_rot = R[1, 0] * x + R[1, 1] * y + R[1, 2] * z
+        z_rot = R[2, 0] * x + R[2, 1] * y + R[2, 2] * z
+
+        lon = math.atan2(y_rot, x_rot) / math.pi * 180
+        lat = -math.asin(z_rot) / math.pi * 180
+
+        mapped[idx, 0] = int(lon / 180 * equ_cx + equ_cx)
+        mapped[idx, 1] = int(lat / 90 * equ_cy + equ_cy)
+    return mapped
+
+
+@njit(cache=True)
+def equirectal_to_perspective_kernel(  # noqa: WPS211
+    coords: np.ndarray,
+    R_inv: np.ndarray,
+    c_x: float,
+    c_y: float,
+    w_interval: float,
+    h_interval: float,
+    equ_cx: float,
+    equ_cy: float,
+) -> np.ndarray:
+    """
+    Projects (N, 2) equirectangular image coordinates to perspective image.
+
+    Returns:
+        (N, 2) float64 array of truncated perspective image coordinates, NaN for points behind the camera.
+    """
+    mapped = np.empty((coords.shape[0], 2), np.float64)
+    for idx in range(coords.shape[0]):
+        lon_rad = math.radians((coords[idx, 0] - equ_cx) / equ_cx * 180.0)
+        lat_rad = math.radians(-(coords[idx, 1] - equ_cy) / equ_cy * 90.0)
+
+        x = math.cos(lat_rad) * math.cos(lon_rad)
+        y = math.cos(lat_rad) * math.sin(lon_rad)
+        z = math.sin(lat_rad)
+
+        x_rot = R_inv[0, 0] * x + R_inv[0, 1] * y + R_inv[0, 2] * z
+        if x_rot <= 0:
+            mapped[idx, 0] = np.nan
+            mapped[idx, 1] = np.nan
+            continue
+        y_rot = R_inv[1, 0] * x + R_inv[1, 1] * y + R_inv[1, 2] * z
+        z_rot = R_inv[2, 0] * x + R_inv[2, 1] * y + R_inv[2, 2] * z
+
+        mapped[idx, 0] = math.trunc(c_x + y_rot / x_rot / w_interval)
+        mapped[idx, 1] = math.trunc(c_y - z_rot / x_rot / h_interval)
+    return mapped
+
+
+@njit(parallel=True, cache=True)
+def equirectal_remap_kernel(  # noqa: WPS211
+    R: np.ndarray,
+    wd: int,
+    hd: int,
+    c_x: float,
+    c_y: float,
+    w_interval: float,
+    h_interval: float,
+    equ_cx: float,
+    equ_cy: float,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Builds remap maps projecting equirectangular image to (hd, wd) perspective image rotated by R.
+
+    Returns:
+        Float32 x (longitude) and y (latitude) maps for cv2.remap.
+    """
+    lon_map = np.empty((hd, wd), np.float32)
+    lat_map = np.empty((hd, wd), np.float32)
+    for i in prange(hd):  # noqa: WPS111
+        z_map = -(i - c_y) * h_interval
+        for j in range(wd):  # noqa: WPS111
+            y_map = (j - c_x) * w_interval
+            distance = math.sqrt(1.0 + y_map * y_map + z_map * z_map)
+            x = 1.0 / distance
+            y = y_map / distance
+            z = z_map / distance
+
+            x_rot = R[0, 0] * x + R[0, 1] * y + R[0, 2] * z
+            y_rot = R[1, 0] * x + R[1, 1] * y + R[1, 2] * z
+            z_rot = R[2, 0] * x + R[2, 1] * y + R[2, 2] * z
+
+            lon = math.atan2(y_rot, x_rot) / math.pi * 180
+            lat = -math.asin(z_rot) / math.pi * 180
+
+            lon_map[i, j] = lon / 180 * equ_cx + equ_cx
+            lat_map[i, j] = lat / 90 * equ_cy + equ_cy
+    return lon_map, lat_map
+
+
+def prewarm_kernels():
+    """Triggers JIT compilation, so first real projection doesn't pay for it."""
+    dummy_coords = np.zeros((1, 2), np.float64)
+    dummy_rotation = np.eye(3, dtype=np.float64)
+    perspective_to_equirectal_kernel(dummy_coords, dummy_rotation, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
+    equirectal_to_perspective_kernel(dummy_coords, dummy_rotation, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0)
@@ -8,22 +8,35 @@ import shapely
 from signs_dashboard.models.bbox_detection import BBOXDetection
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.services.pano_conversions.common import CropsParams
-from signs_dashboard.services.pano_conversions.from_equirectangular import equirectal_coords_to_perspective
+from signs_dashboard.services.pano_conversions.from_equirectangular import (
+    equirectal_coords_array_to_perspective,
+    perspective_coords_array_as_list,
+)
 from signs_dashboard.services.pano_conversions.from_perspective import perspective_coords_to_equirectal
+from signs_dashboard.services.pano_conversions.kernels import prewarm_kernels
 from signs_dashboard.services.prediction_answer_parser import BBox
 from signs_dashboard.small_utils import detection_polygon_as_points, detection_polygon_points_as_polygon
 
 logger = logging.getLogger(__name__)
 BBoxes = dict[str, list[BBox]]
+CROP_PERIMETER_STEP = 10
+CROP_EQUIRECTAL_BBOX_MARGIN = 32
 
 
 class PanoramicConversionsService:
+    def __init__(self):
+        prewarm_kernels()
+
     def find_detections_from_crop(self, frame: Frame, theta: int, detector_name: str) -> list[BBOXDetection]:
+        detections = frame.detections_by_detector.get(detector_name, [])
+        bboxes = _bboxes_as_array(detections).reshape(-1, 4)
+        # exact outline check runs only for candidates overlapping crop footprint
+        candidates_mask = self._overlaps_crop_equirectal_bboxes(bboxes, theta=theta)
+        candidates = [detection for detection, is_candidate in zip(detections, candidates_mask) if is_candidate]
+        outlines = self._project_bboxes_outlines_to_perspective(bboxes[candidates_mask], theta=theta)
         detections_from_crop = []
-        for detection in frame.detections:
-            if detection.detector_name != detector_name:
-                continue
-            if self._intersects_outline(detection, theta=theta):
+        for detection, outline_coords in zip(candidates, outlines):
+            if self._intersects_outline(outline_coords):
                 logger.info(
                     f'Frame {frame.id} detection {detection.as_json()} intersects crop outline {theta=}',
                 )
@@ -36,29 +49,32 @@ class PanoramicConversionsService:
         theta: int,
         convert_polygon: bool,
     ) -> list[BBOXDetection]:
-        converted_detections = []
-        for detection in detections:
-            converted_coords = equirectal_coords_to_perspective(
-                [
-                    (detection.x_from, detection.y_from),
-                    (detection.x_to, detection.y_to),
-                ],
-                theta=theta,
-            )
+        bboxes_corners = equirectal_coords_array_to_perspective(
+            _bboxes_as_array(detections),
+            theta=theta,
+        ).reshape(-1, 2, 2)
 
-            if len(converted_coords) != 2 or self._isnan_coords(converted_coords):
+        converted_detections = []
+        for detection, converted_coords in zip(detections, bboxes_corners.tolist()):
+            if self._isnan_coords(converted_coords):
                 continue
 
-            point_from, point_to = converted_coords
+            point_from, point_to = [(int(x_p), int(y_p)) for x_p, y_p in converted_coords]
             detection.x_from, detection.y_from = point_from[0], point_from[1]
             detection.width = point_to[0] - point_from[0]
             detection.height = point_to[1] - point_from[1]
+            converted_detections.append(detection)
 
-            if convert_polygon and detection.polygon:
-                detection.polygon = self._convert_polygon_points_to_perspective(detection.polygon, theta=theta)
+        if convert_polygon:
+            detections_with_polygon = [detection for detection in converted_detections if detection.polygon]
+            converted_polygons = self._convert_polygons_points_to_perspective(
+                [detection.polygon for detection in detections_with_polygon],
+                theta=theta,
+            )
+            for detection, polygon in zip(detections_with_polygon, converted_polygons):
+                detection.polygon = polygon
                 detection.polygon_cv2 = [detection_polygon_as_points(detection.polygon)]
 
-            converted_detections.append(detection)
         return converted_detections
 
     def prepare_detections_for_equirectal_render(self, detections: list[BBOXDetection]):
@@ -71,15 +87,13 @@ class PanoramicConversionsService:
             (seam_position + seam_width, 0),
             (seam_position - seam_width, 0),
         ])
-        for detection in detections:
-            if not detection.polygon:
-                continue
-            detection_polygon = shapely.Polygon(
-                shell=equirectal_coords_to_perspective(
-                    coords=detection_polygon_as_points(detection.polygon),
-                    theta=CropsParams.SEAM_THETA,
-                ),
-            )
+        detections_with_polygon = [detection for detection in detections if detection.polygon]
+        projected_polygons = self._project_polygons_to_perspective(
+            [detection.polygon for detection in detections_with_polygon],
+            theta=CropsParams.SEAM_THETA,
+        )
+        for detection, polygon_coords in zip(detections_with_polygon, projected_polygons):
+            detection_polygon = shapely.Polygon(shell=polygon_coords)
             if equirect_image_seam.intersects(detection_polygon):
                 difference = detection_polygon.difference(equirect_image_seam)
                 logger.debug(f'Frame {detection.frame_id} detection {detection.id} split by seam, got {difference}')
@@ -117,14 +131,35 @@ class PanoramicConversionsService:
             equirectangle_bbox.polygon = detection_polygon_points_as_polygon(coords[2:])
         return equirectangle_bbox
 
-    def _convert_polygon_points_to_perspective(self, polygon: list[int], theta: int) -> Optional[list[int]]:
-        converted_polygon = equirectal_coords_to_perspective(
-            detection_polygon_as_points(polygon),
-            theta=theta,
+    def _convert_polygons_points_to_perspective(
+        self,
+        polygons: list[list[int]],
+        theta: int,
+    ) -> list[Optional[list[int]]]:
+        return [
+            detection_polygon_points_as_polygon(converted_polygon) if len(converted_polygon) > 2 else None
+            for converted_polygon in self._project_polygons_to_perspective(polygons, theta=theta)
+        ]
+
+    def _project_polygons_to_perspective(self, polygons: list[list[int]], theta: int) -> list[list[tuple[int, int]]]:
+        if not polygons:
+            return []
+        # project points of all polygons at once, then split them back by polygon
+        points = np.concatenate([np.asarray(polygon, dtype=np.float64).reshape(-1, 2) for polygon in polygons])
+        split_indices = np.cumsum([len(polygon) // 2 for polygon in polygons])[:-1]
+        projected_points = equirectal_coords_array_to_perspective(points, theta=theta)
+        return [
+            perspective_coords_array_as_list(polygon_points)
+            for polygon_points in np.split(projected_points, split_indices)
+        ]
+
+    def _project_bboxes_outlines_to_perspective(self, bboxes: np.ndarray, theta: int) -> np.ndarray:
+        x_from, y_from, x_to, y_to = bboxes.T
+        outlines = np.stack(
+            [x_from, y_from, x_to, y_from, x_to, y_to, x_from, y_to, x_from, y_from],
+            axis=1,
         )
-        if len(converted_polygon) > 2:
-            return detection_polygon_points_as_polygon(converted_polygon)
-        return None
+        return equirectal_coords_array_to_perspective(outlines, theta=theta).reshape(-1, 5, 2)
 
     def _shapely_polygon_as_equirectal_cv2(self, difference: shapely.geometry.base.BaseGeometry):
         if isinstance(difference, shapely.geometry.base.BaseMultipartGeometry):
@@ -140,35 +175,84 @@ class PanoramicConversionsService:
         return None
 
     def _isnan_coords(self, coords: list[tuple[int, int]]) -> bool:
-        return any(np.isnan(coord) or coord < 0 for point in coords for coord in point)
-
-    def _intersects_outline(self, detection: BBOXDetection, theta: int) -> bool:
-        outline = self._get_crop_boundary()
-        polygon_coords = equirectal_coords_to_perspective(
-            coords=[
-                (detection.x_from, detection.y_from),
-                (detection.x_to, detection.y_from),
-                (detection.x_to, detection.y_to),
-                (detection.x_from, detection.y_to),
-                (detection.x_from, detection.y_from),
-            ],
-            theta=theta,
-        )
+        coords_array = np.asarray(coords, dtype=np.float64)
+        return bool(np.isnan(coords_array).any() or (coords_array < 0).any())
+
+    def _overlaps_crop_equirectal_bboxes(self, bboxes: np.ndarray, theta: int) -> np.ndarray:
+        overlaps = np.zeros(len(bboxes), dtype=bool)
+        for xmin, ymin, xmax, ymax in _get_crop_equirectal_bboxes(theta):
+            overlaps |= (
+                (bboxes[:, 0] <= xmax) & (bboxes[:, 2] >= xmin) & (bboxes[:, 1] <= ymax) & (bboxes[:, 3] >= ymin)
+            )
+        return overlaps
+
+    def _intersects_outline(self, polygon_coords: np.ndarray) -> bool:
         if self._isnan_coords(polygon_coords):
             return False
 
+        width, height = CropsParams.crop_size
+        x_min, y_min = polygon_coords.min(axis=0)
+        x_max, y_max = polygon_coords.max(axis=0)
+        # coords are non-negative here, so only far crop sides can be missed
+        if x_min > width or y_min > height:
+            return False
+        # outline is a filled rectangle, detection lying within it always intersects it
+        if x_max <= width and y_max <= height:
+            return True
+
+        outline = _get_crop_boundary(width, height)
         det_polygon = shapely.Polygon(shell=polygon_coords)
         return shapely.intersects(outline, det_polygon)
 
-    @lru_cache
-    def _get_crop_boundary(self) -> shapely.Polygon:
-        width, height = CropsParams.crop_size
-        return shapely.Polygon(
-            shell=[  # noqa: WPS317
-                *[(0, height_i) for height_i in range(height)],
-                *[(width_i, height) for width_i in range(width)],
-                *[(width, height - height_i) for height_i in range(height)],
-                *[(width - width_i, 0) for width_i in range(width)],
-                (0, 0),
-            ],
-        )
+
+def _bboxes_as_array(detections: list[BBOXDetection]) -> np.ndarray:
+    return np.array(
+        [
+            (detection.x_from, detection.y_from, detection.x_to, detection.y_to)
+            for detection in detections
+        ],
+        dtype=np.float64,
+    ).reshape(-1, 2)
+
+
+@lru_cache
+def _get_crop_equirectal_bboxes(theta: int) -> list[tuple[float, float, float, float]]:
+    """
+    Calculates bounding boxes of the crop footprint on equirectangular image.
+
+    Crop edges are curved on equirectangular image, so footprint is found by projecting crop perimeter.
+    Crop crossing the equirectangular image seam gets two bounding boxes, one per image side.
+
+    Args:
+        theta: Rotation around the Z-axis in degrees.
+
+    Returns:
+        List of (xmin, ymin, xmax, ymax) bounding boxes, extended by a margin.
+    """
+    width, height = CropsParams.crop_size
+    perimeter = [
+        *[(width_i, 0) for width_i in range(0, width, CROP_PERIMETER_STEP)],
+        *[(width, height_i) for height_i in range(0, height, CROP_PERIMETER_STEP)],
+        *[(width - width_i, height) for width_i in range(0, width, CROP_PERIMETER_STEP)],
+        *[(0, height - height_i) for height_i in range(0, height, CROP_PERIMETER_STEP)],
+    ]
+    footprint = np.asarray(perspective_coords_to_equirectal(perimeter, theta=theta), dtype=np.float64)
+    xs, ys = footprint[:, 0], footprint[:, 1]
+    ymin, ymax = ys.min() - CROP_EQUIRECTAL_BBOX_MARGIN, ys.max() + CROP_EQUIRECTAL_BBOX_MARGIN
+
+    equ_cx = CropsParams.VIDEO360_WIDTH / 2
+    if xs.max() - xs.min() < equ_cx:
+        return [(xs.min() - CROP_EQUIRECTAL_BBOX_MARGIN, ymin, xs.max() + CROP_EQUIRECTAL_BBOX_MARGIN, ymax)]
+    right_xs, left_xs = xs[xs >= equ_cx], xs[xs < equ_cx]
+    return [
+        (right_xs.min() - CROP_EQUIRECTAL_BBOX_MARGIN, ymin, CropsParams.VIDEO360_WIDTH, ymax),
+        (0, ymin, left_xs.max() + CROP_EQUIRECTAL_BBOX_MARGIN, ymax),
+    ]
+
+
+@lru_cache
+def _get_crop_boundary(width: int, height: int) -> shapely.Polygon:
+    boundary = shapely.box(0, 0, width, height)
+    # prepared geometry speeds up repeated intersects checks against detections
+    shapely.prepare(boundary)
+    return boundary
@@ -1,16 +1,25 @@
 import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from io import BytesIO
-from typing import Iterator, Optional
+from itertools import chain
+from typing import Iterable, Iterator, Optional
 
 import requests
-from PIL import Image
+from PIL import Image, ImageChops
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 from yarl import URL
 
 from signs_dashboard.schemas.video_frames_saver import VideoFrame
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CONNECT_TIMEOUT_SEC = 5
+DEFAULT_READ_TIMEOUT_SEC = 60
+
 
 class PanoramaRotationFixer:
     def __init__(self, config: dict):
@@ -19,41 +28,73 @@ class PanoramaRotationFixer:
         if self._base_url:
             self._base_url = URL(self._base_url)
         self._batch_size = config.get('batch_size', 5)
+        self._timeout = (
+            config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT_SEC),
+            config.get('read_timeout', DEFAULT_READ_TIMEOUT_SEC),
+        )
+        rotation_workers = config.get('rotation_workers') or os.cpu_count() or 1
+        self._rotation_executor = ThreadPoolExecutor(max_workers=rotation_workers)
+        self._max_in_flight_rotations = rotation_workers * 2
+        self._session = requests.Session()
+        self._session.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
 
     def wrap_iterator(self, iterator: Iterator[VideoFrame]) -> Iterator[VideoFrame]:
+        iterator = iter(iterator)
         batch = []
         holded_frames = []
         rotation_angle = None
         for video_frame in iterator:
-            if rotation_angle is not None:
-                yield self._rotate_panorama(video_frame, rotation_angle=rotation_angle)
+            batch.append(video_frame)
+            if len(batch) < self._batch_size:
                 continue
 
-            batch.append(video_frame)
-            if len(batch) == self._batch_size:
-                rotation_angle = self._get_rotation_angle(batch)
-                if rotation_angle is None:
-                    logger.warning(f'Failed to get rotation angle for batch {len(batch)}, holding batch')
-                    holded_frames += batch
-                else:
-                    logger.warning(f'Got rotation angle {rotation_angle} for batch {len(batch)}, processing batch')
-                    yield from map(partial(self._rotate_panorama, rotation_angle=rotation_angle), holded_frames)
-                    holded_frames = []
-                    yield from map(partial(self._rotate_panorama, rotation_angle=rotation_angle), batch)
-                batch = []
-        if batch or holded_frames:
+            rotation_angle = self._get_rotation_angle(batch)
+            if rotation_angle is not None:
+                logger.warning(f'Got rotation angle {rotation_angle} for batch {len(batch)}, processing batch')
+                break
+            logger.warning(f'Failed to get rotation angle for batch {len(batch)}, holding batch')
+            holded_frames += batch
+            batch = []
+
+        if rotation_angle is None and (batch or holded_frames):
             logger.warning('Processing remaining frames')
-            yield from map(partial(self._rotate_panorama, rotation_angle=rotation_angle), holded_frames)
-            yield from map(partial(self._rotate_panorama, rotation_angle=rotation_angle), batch)
+        # iterator is already exhausted if rotation angle was not found
+        yield from self._rotate_frames(chain(holded_frames, batch, iterator), rotation_angle=rotation_angle)
+
+    def _rotate_frames(
+        self,
+        video_frames: Iterable[VideoFrame],
+        rotation_angle: Optional[float],
+    ) -> Iterator[VideoFrame]:
+        rotate = partial(self._rotate_panorama, rotation_angle=rotation_angle)
+        # bounded window of in-flight rotations keeps output order and memory usage in check
+        in_flight = deque()
+        for video_frame in video_frames:
+            in_flight.append(self._rotation_executor.submit(rotate, video_frame))
+            if len(in_flight) >= self._max_in_flight_rotations:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
 
     def _get_rotation_angle(self, batch: list[VideoFrame]) -> Optional[float]:
-        resp = requests.post(
-            self._base_url / 'api/1.0/correct_panoramas',
-            files=[
+        # streamed multipart body, so panoramas are not copied into one more in-memory buffer
+        encoder = MultipartEncoder(
+            fields=[
                 ('pano', ('pano.jpg', vframe.image, 'image/jpeg'))
                 for vframe in batch
             ],
         )
+        try:
+            resp = self._session.post(
+                self._base_url / 'api/1.0/correct_panoramas',
+                data=encoder,
+                headers={'Content-Type': encoder.content_type},
+                timeout=self._timeout,
+            )
+        except requests.RequestException as exc:
+            logger.warning(f'Panorama-fixer request failed: {exc}')
+            return None
         if resp.status_code != 200:
             logger.warning(f'Panorama-fixer responded with non-200: {resp.status_code} {resp.text}')
             return None
@@ -76,12 +117,10 @@ class PanoramaRotationFixer:
         rotation_line = (width / 2) - (width * (rotation_angle / 360)) % width
         crop_x = int((rotation_line + width / 2) % width)
 
-        left_cropped_section = image.crop((0, 0, crop_x, height))
-        right_shifted_part = image.crop((crop_x, 0, width, height))
-
-        result_image = Image.new('RGB', (width, height))
-        result_image.paste(right_shifted_part, (0, 0))
-        result_image.paste(left_cropped_section, (width - crop_x, 0))
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+        # cyclic horizontal shift, so that column crop_x becomes the first one
+        result_image = ImageChops.offset(image, width - crop_x, 0)
 
         buffer = BytesIO()
         result_image.save(buffer, exif=image.info.get('exif'), format='jpeg')
@@ -1,5 +1,5 @@
 import logging
-from collections import defaultdict
+from collections import Counter, defaultdict
 from functools import cached_property
 from typing import Optional
 
@@ -11,7 +11,7 @@ from signs_dashboard.models.prediction import Prediction
 from signs_dashboard.modules_config import ModulesConfig
 from signs_dashboard.repository.bbox_detections import BBOXDetectionsRepository
 from signs_dashboard.repository.predictions import PredictionsRepository
-from signs_dashboard.schemas.frames import FramesOperations
+from signs_dashboard.schemas.frames import frames_ids_and_daterange
 from signs_dashboard.schemas.prediction import BBox, PredictorAnswer
 from signs_dashboard.services.frames_depth import FramesDepthService
 from signs_dashboard.services.pano_conversions.service import PanoramicConversionsService
@@ -26,38 +26,44 @@ class PredictionStatusProxy:
     def __init__(self, predictions_result: list[Prediction], required_predictors: list[str]):
         self.required_predictors = required_predictors
         self.other_predictors = set()
+        self._required_set = frozenset(required_predictors)
 
         self._result: dict[int, dict[str, Prediction]] = defaultdict(dict)
         for prediction in predictions_result:
             self._result[prediction.frame_id][prediction.detector_name] = prediction
 
-            if prediction.detector_name not in self.required_predictors:
+            if prediction.detector_name not in self._required_set:
                 self.other_predictors.add(prediction.detector_name)
 
+        # proxy is read-only after construction, so counters are computed once
+        self._predictions_count = Counter(
+            predictor
+            for predictions_map in self._result.values()
+            for predictor in predictions_map
+        )
+        self._ready_frames_count = sum(
+            1 for predictions_map in self._result.values() if self._required_set.issubset(predictions_map)
+        )
+
     @cached_property
-    def predictors(self) -> list[str]:
-        return [*self.required_predictors, *self.other_predictors]
+    def predictors(self) -> frozenset[str]:
+        return self._required_set | self.other_predictors
 
     @property
     def frame_ids(self) -> list[int]:
         return list(self._result)
 
     def count_predictions(self, predictor: str) -> int:
-        return sum(1 for predictions_map in self._result.values() if predictions_map.get(predictor))
+        return self._predictions_count[predictor]
 
     def count_ready_frames(self) -> int:
-        return sum(
-            1 for predictions_map in self._result.values() if len(predictions_map) == len(self.required_predictors)
-        )
+        return self._ready_frames_count
 
     def frame_has_all_predictions(self, frame_id: int) -> bool:
-        return len(self._result.get(frame_id, {})) == len(self.required_predictors)
+        return self._required_set.issubset(self._result.get(frame_id, {}))
 
     def has_all_predictions(self) -> bool:
-        return all((
-            self.frame_has_all_predictions(frame_id)
-            for frame_id in self._result
-        ))
+        return self._ready_frames_count == len(self._result)
 
     def get_prediction(self, predictor: str, frame_id: int) -> Optional[Prediction]:
         return self._result.get(frame_id, {}).get(predictor)
@@ -115,11 +121,10 @@ class PredictionService:
         predictors: list[str],
         all_predictors: bool = False,
     ) -> PredictionStatusProxy:
-        frames_operations = FramesOperations(frames_map={frame.id: frame for frame in frames})
-        min_frames_date, max_frames_date = frames_operations.min_max_frames_date
+        frame_ids, min_frames_date, max_frames_date = frames_ids_and_daterange(frames)
 
         predictions = self._predictions_repository.find(
-            frame_ids=frames_operations.list_ids,
+            frame_ids=frame_ids,
             predictors=None if all_predictors else predictors,
             min_date=min_frames_date,
             max_date=max_frames_date,
@@ -135,12 +140,12 @@ class PredictionService:
         frames: list[Frame],
         predictors: list[str],
     ) -> FramesBatchAttributes:
-        frame_ids = [frame.id for frame in frames]
+        frame_ids, min_frames_date, max_frames_date = frames_ids_and_daterange(frames)
         raw_attributes = self._predictions_repository.get_frames_attributes(
             frame_ids,
             detector_names=predictors,
-            min_frame_date=min(frame.date for frame in frames) if frames else None,
-            max_frame_date=max(frame.date for frame in frames) if frames else None,
+            min_frame_date=min_frames_date,
+            max_frame_date=max_frames_date,
         )
         frames_batch_attributes = FramesBatchAttributes(frames, predictors)
         for attribute in raw_attributes:
@@ -205,27 +210,14 @@ class PredictionService:
                 theta=theta,
             )
 
-        for label, bboxes in results.items():
-            for bbox in bboxes:
-                base_bbox = self._bbox_detections_repository.create(
-                    frame=frame,
-                    detector_name=predictor_name,
-                    label=label,
-                    bbox=bbox,
-                    polygon=bbox.polygon,
-                )
-
-                for related_bbox in bbox.related_bboxes:
-                    self._bbox_detections_repository.create(
-                        frame=frame,
-                        detector_name=predictor_name,
-                        bbox=related_bbox,
-                        base_bbox=base_bbox,
-                    )
+        self._bbox_detections_repository.bulk_create(
+            frame=frame,
+            detector_name=predictor_name,
+            bboxes=results,
+        )
 
     def save_detections_locations(self, detections: list[BBOXDetection]):
-        for detection in detections:
-            self._bbox_detections_repository.save_location_info(detection)
+        self._bbox_detections_repository.bulk_save_location_info(detections)
 
     def parse_prediction(self, message_body: dict, predictor_name_override: Optional[str]) -> PredictorAnswer:
         try:
@@ -28,8 +28,11 @@ class PredictorAnswerParser:
         if predictor_name_override:
             message_body['predictor'] = predictor_name_override
 
-        if predictor_name_override in self.old_format_predictors_map:
-            return self.old_format_predictors_map[predictor_name_override](message_body, predictor_name_override)  # noqa: E501, WPS529
+        # old format parsers fall back to PredictorAnswer themselves if message is in new format
+        predictor_name = message_body.get('predictor')
+        old_format_parser = self.old_format_predictors_map.get(predictor_name)
+        if old_format_parser:
+            return old_format_parser(message_body, predictor_name)
 
         return PredictorAnswer(**message_body)
 
@@ -58,12 +61,11 @@ class PredictorAnswerParser:
             bboxes = defaultdict(list)
             for sign_data in signs_data:
                 bbox_base = self._create_bbox_from_signs_format(sign_data)
-
-                for plate_data in get_value(sign_data, 'plates', []):
-                    plate_bbox = self._create_bbox_from_signs_format(plate_data)
-                    bbox_base.related_bboxes.append(plate_bbox)
-
-                bboxes.setdefault(bbox_base.label, []).append(bbox_base)
+                bbox_base.related_bboxes.extend(
+                    self._create_bbox_from_signs_format(plate_data)
+                    for plate_data in get_value(sign_data, 'plates', ())
+                )
+                bboxes[bbox_base.label].append(bbox_base)
 
         return PredictorAnswer(
             predictor=predictor_name,
@@ -2,6 +2,8 @@ import logging
 import typing as tp
 from datetime import datetime, timedelta
 
+from kafka.producer.future import FutureRecordMetadata
+
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.repository.predictors import PredictorsRepository
 from signs_dashboard.services.events.frames_lifecycle import FramesLifecycleService
@@ -9,6 +11,8 @@ from signs_dashboard.services.pano_conversions.common import CropsParams
 
 logger = logging.getLogger(__name__)
 
+PROMPT_PREDICTOR_NAME = 'prompt-detection'
+
 
 class PredictorsService:
     def __init__(
@@ -23,15 +27,28 @@ class PredictorsService:
         self._predictors_repository = predictors_repository
         self._register_ttl = cfg['register_predictor_ttl_seconds']
 
+        # predictors config is static, so everything derived from it is computed once
+        self._active_predictors = frozenset(
+            predictor for reporter in self._reporters for predictor in reporter['predictors']
+        )
+        self._configured_predictors = self._active_predictors | {predictor['name'] for predictor in self._predictors}
+        self._prompt = next(
+            (
+                predictor['prompt']
+                for predictor in self._predictors
+                if self.has_prompt(predictor['name']) and predictor['name'] in self._active_predictors
+            ),
+            None,
+        )
+
     def get_active_predictors(self) -> list[str]:
-        return list({predictor for reporter in self._reporters for predictor in reporter['predictors']})
+        return list(self._active_predictors)
 
     def get_all_predictors(self) -> list[str]:
         return sorted(
             {
-                *self.get_active_predictors(),
+                *self._configured_predictors,
                 *[predictor.name for predictor in self.get_faust_predictors()],
-                *[predictor['name'] for predictor in self._predictors],
             },
         )
 
@@ -45,20 +62,13 @@ class PredictorsService:
         ]
 
     def get_prompt(self) -> tp.Optional[str]:
-        active_predictors = self.get_active_predictors()
-        try:
-            return [
-                predictor['prompt'] for predictor in self._predictors
-                if self.has_prompt(predictor) and predictor['name'] in active_predictors
-            ][0]
-        except IndexError:
-            return None
+        return self._prompt
 
     def has_prompt(self, predictor_name: str) -> bool:
-        return predictor_name == 'prompt-detection'
+        return predictor_name == PROMPT_PREDICTOR_NAME
 
     def is_camcom_predictor_enabled(self) -> bool:
-        return 'camcom' in self.get_active_predictors()
+        return 'camcom' in self._active_predictors
 
     def send_frames_to_predictor(
         self,
@@ -69,34 +79,49 @@ class PredictorsService:
     ) -> tuple[list[Frame], list[Frame]]:
         sended_frames = []
         error_frames = []
+        # all events are enqueued first, so producer sends them in batches instead of one round-trip per event
+        frames_futures = []
         for frame in frames:
             try:
-                self._produce_event(
+                frames_futures.append((
                     frame,
-                    predictor=predictor,
-                    prompt=prompt,
-                    recalculate_interest_zones=recalculate_interest_zones,
-                )
+                    self._produce_event(
+                        frame,
+                        predictor=predictor,
+                        prompt=prompt,
+                        recalculate_interest_zones=recalculate_interest_zones,
+                    ),
+                ))
+            except Exception:
+                logger.exception('Failed send frame %s to predictor %s', frame.id, predictor)
+                error_frames.append(frame)
+
+        for frame, futures in frames_futures:
+            try:
+                for future in futures:
+                    self._frames_lifecycle_service.wait_sent(future)
                 sended_frames.append(frame)
             except Exception:
                 logger.exception('Failed send frame %s to predictor %s', frame.id, predictor)
                 error_frames.append(frame)
         return sended_frames, error_frames
 
-    def _produce_event(self, frame: Frame, predictor: str, prompt: tp.Optional[str], recalculate_interest_zones: bool):
-        if frame.panoramic:
-            for theta in CropsParams.CROPS_Z_POSITIONS:
-                self._frames_lifecycle_service.produce_prediction_required_event(
-                    frame=frame,
-                    required_predictors=[predictor],
-                    prompt=prompt,
-                    theta=theta,
-                    recalculate_interest_zones=recalculate_interest_zones,
-                )
-        else:
+    def _produce_event(
+        self,
+        frame: Frame,
+        predictor: str,
+        prompt: tp.Optional[str],
+        recalculate_interest_zones: bool,
+    ) -> list[FutureRecordMetadata]:
+        thetas = CropsParams.CROPS_Z_POSITIONS if frame.panoramic else (None,)
+        return [
             self._frames_lifecycle_service.produce_prediction_required_event(
                 frame=frame,
                 required_predictors=[predictor],
                 prompt=prompt,
+                theta=theta,
                 recalculate_interest_zones=recalculate_interest_zones,
+                wait=False,
             )
+            for theta in thetas
+        ]
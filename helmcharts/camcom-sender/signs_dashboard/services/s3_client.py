@@ -1,32 +1,55 @@
 import json
 import logging
-from functools import lru_cache
-from typing import BinaryIO, List, Optional
+import threading
+from typing import BinaryIO, Iterator, List, Optional
 
 import boto3
 from botocore.config import Config
 from botocore.exceptions import ClientError
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+BUCKET_EXISTS_CACHE_SIZE = 256
+BUCKET_EXISTS_CACHE_TTL_SEC = 3600
+# should be not less than number of threads uploading concurrently, otherwise extra connections are reopened
+DEFAULT_MAX_POOL_CONNECTIONS = 50
+DEFAULT_CONNECT_TIMEOUT_SEC = 5
+DEFAULT_READ_TIMEOUT_SEC = 60
+DEFAULT_RETRIES_MODE = 'adaptive'
+DEFAULT_RETRIES_MAX_ATTEMPTS = 5
+LIST_OBJECTS_PAGE_SIZE = 1000
+
 
 class S3ClientService:
     def __init__(self, s3_config: dict):
         raw_config = s3_config['client_params'].pop('config', {})
-        config = Config(max_pool_connections=int(raw_config.get('max_pool_connections', 10)))
+        config = Config(
+            max_pool_connections=int(raw_config.get('max_pool_connections', DEFAULT_MAX_POOL_CONNECTIONS)),
+            connect_timeout=raw_config.get('connect_timeout', DEFAULT_CONNECT_TIMEOUT_SEC),
+            read_timeout=raw_config.get('read_timeout', DEFAULT_READ_TIMEOUT_SEC),
+            retries={
+                'mode': raw_config.get('retries_mode', DEFAULT_RETRIES_MODE),
+                'max_attempts': int(raw_config.get('retries_max_attempts', DEFAULT_RETRIES_MAX_ATTEMPTS)),
+            },
+            tcp_keepalive=raw_config.get('tcp_keepalive', True),
+        )
 
         self._client = boto3.client('s3', config=config, **s3_config['client_params'])
         self.base_url = s3_config['client_params']['endpoint_url']
         self._set_public_read = s3_config.get('set_public_read_acl', False)
+        # bounded by size and age, so buckets created or deleted elsewhere are picked up eventually
+        self._bucket_exists_cache = TTLCache(maxsize=BUCKET_EXISTS_CACHE_SIZE, ttl=BUCKET_EXISTS_CACHE_TTL_SEC)
+        self._bucket_exists_lock = threading.Lock()
 
-    @lru_cache
     def is_bucket_exist(self, bucket: str) -> bool:
-        try:
-            self._client.head_bucket(Bucket=bucket)
-            return True
-        except ClientError as error:
-            logger.debug('Bucket %s is not exist because of %s', bucket, error)
-        return False
+        exists = self._get_cached_bucket_exists(bucket)
+        if exists is not None:
+            return exists
+
+        exists = self._head_bucket(bucket)
+        self._set_bucket_exists(bucket, exists)
+        return exists
 
     def create_bucket(self, bucket: str):
         logger.info('Create bucket %s', bucket)
@@ -38,7 +61,7 @@ class S3ClientService:
         except ClientError as error:
             # There is no way to create bucket in transaction or other synchronization context,
             # race condition occurred. So, just skip this error.
-            if type(error).__name__ in {'BucketAlreadyOwnedByYou', 'BucketAlreadyExists'}:
+            if _error_code(error) in {'BucketAlreadyOwnedByYou', 'BucketAlreadyExists'}:
                 logger.debug('Unable to create bucket %s, already created', bucket)
                 return
             raise
@@ -70,15 +93,39 @@ class S3ClientService:
     ) -> bool:
         if not self.is_bucket_exist(bucket):
             self.create_bucket(bucket)
-            self.is_bucket_exist.cache_clear()
+            self._set_bucket_exists(bucket, exists=True)
             return True
         return False
 
     def list_objects(self, bucket: str, prefix: str) -> List[dict]:
-        return self._client.list_objects(
+        return list(self.iter_objects(bucket=bucket, prefix=prefix))
+
+    def list_objects_if_bucket_exists(self, bucket: str, prefix: str) -> List[dict]:
+        # listing of missing bucket fails with NoSuchBucket, so there is no need in head_bucket request before it
+        if self._get_cached_bucket_exists(bucket) is False:
+            return []
+
+        try:
+            objects = self.list_objects(bucket=bucket, prefix=prefix)
+        except ClientError as error:
+            if _error_code(error) != 'NoSuchBucket':
+                raise
+            logger.debug('Bucket %s is not exist, nothing to list', bucket)
+            self._set_bucket_exists(bucket, exists=False)
+            return []
+
+        self._set_bucket_exists(bucket, exists=True)
+        return objects
+
+    def iter_objects(self, bucket: str, prefix: str) -> Iterator[dict]:
+        # single list_objects call returns at most 1000 keys, paginator follows continuation tokens
+        pages = self._client.get_paginator('list_objects_v2').paginate(
             Prefix=prefix,
             Bucket=bucket,
-        ).get('Contents', [])
+            PaginationConfig={'PageSize': LIST_OBJECTS_PAGE_SIZE},
+        )
+        for page in pages:
+            yield from page.get('Contents', [])
 
     def download_fileobj(self, bucket: str, key: str, fileobj: BinaryIO):
         return self._client.download_fileobj(Bucket=bucket, Key=key, Fileobj=fileobj)
@@ -104,13 +151,38 @@ class S3ClientService:
             ExtraArgs=extra_args,
         )
 
+    def put_object(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str,
+        body: bytes,
+        extra_args: Optional[dict] = None,
+    ):
+        # single PutObject request, without transfer manager threads, for small in-memory payloads
+        extra_args = {
+            'ContentType': content_type,
+            **(extra_args or {}),
+        }
+        if self._set_public_read:
+            extra_args.update({'ACL': 'public-read'})
+        self._client.put_object(
+            Body=body,
+            Bucket=bucket,
+            Key=key,
+            **extra_args,
+        )
+
+    def get_object_bytes(self, bucket: str, key: str) -> bytes:
+        return self._client.get_object(Bucket=bucket, Key=key)['Body'].read()
+
     def get_bucket_lifecycle_configuration(self, bucket: str) -> Optional[dict]:  # noqa: WPS615
         try:
             return self._client.get_bucket_lifecycle_configuration(
                 Bucket=bucket,
             )
         except ClientError as error:
-            if type(error).__name__ == 'NoSuchLifecycleConfiguration':
+            if _error_code(error) == 'NoSuchLifecycleConfiguration':
                 return None
             raise error
 
@@ -119,3 +191,23 @@ class S3ClientService:
             Bucket=bucket,
             LifecycleConfiguration=configuration,
         )
+
+    def _head_bucket(self, bucket: str) -> bool:
+        try:
+            self._client.head_bucket(Bucket=bucket)
+            return True
+        except ClientError as error:
+            logger.debug('Bucket %s is not exist because of %s', bucket, error)
+        return False
+
+    def _get_cached_bucket_exists(self, bucket: str) -> Optional[bool]:
+        with self._bucket_exists_lock:
+            return self._bucket_exists_cache.get(bucket)
+
+    def _set_bucket_exists(self, bucket: str, exists: bool):
+        with self._bucket_exists_lock:
+            self._bucket_exists_cache[bucket] = exists
+
+
+def _error_code(error: ClientError) -> Optional[str]:
+    return error.response.get('Error', {}).get('Code')
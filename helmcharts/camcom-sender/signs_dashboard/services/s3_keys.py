@@ -1,85 +1,105 @@
-import re
-from datetime import date
-from typing import Optional
+import string
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Callable, Optional
 
 from signs_dashboard.models.frame import Frame
 from signs_dashboard.schemas.track_log import TrackLog
 from signs_dashboard.small_utils import correct_round
 
 DATE_FORMAT = '%Y-%m-%d'
-template_placeholders_re = re.compile('(?<={).*?(?=})', flags=re.DOTALL)  # from '{placeholder}' matches 'placeholder'
-placeholder_key_re = re.compile('^[a-z_]+$')
+PLACEHOLDER_CHARS = frozenset(f'{string.ascii_lowercase}_')
+
+# значения плейсхолдеров ключей кадра, вызываются с (frame, theta)
+FRAME_KEY_VALUES: dict[str, Callable[[Frame, Optional[int]], Any]] = {
+    'track_email': lambda frame, theta: frame.track_email,
+    'track_uuid': lambda frame, theta: frame.track_uuid,
+    'frame_date': lambda frame, theta: format_day(frame.date),
+    'frame_timestamp_ms': lambda frame, theta: frame.timestamp,
+    'lat': lambda frame, theta: _format_coord(frame.lat),
+    'lon': lambda frame, theta: _format_coord(frame.lon),
+}
+CROP_FRAME_KEY_VALUES = {
+    **FRAME_KEY_VALUES,
+    'theta': lambda frame, theta: theta,
+}
+DEPTH_MAP_KEY_VALUES = {
+    **FRAME_KEY_VALUES,
+    'lat': lambda frame, theta: _round_coord(frame.lat),
+    'lon': lambda frame, theta: _round_coord(frame.lon),
+}
+CROP_DEPTH_MAP_KEY_VALUES = {
+    **DEPTH_MAP_KEY_VALUES,
+    'theta': lambda frame, theta: theta,
+}
+
+
+class KeyFormatter:
+    """
+    Шаблон ключа, для которого значения считаются только для плейсхолдеров, присутствующих в шаблоне
+    """
+
+    def __init__(self, template: Optional[str], placeholders_values: dict[str, Callable[..., Any]]):
+        self.template = template
+        placeholders = set(_find_placeholders(template or ''))
+        self._placeholders_values = [
+            (placeholder, get_value)
+            for placeholder, get_value in placeholders_values.items()
+            if placeholder in placeholders
+        ]
+
+    def format(self, *args) -> str:
+        return self.template.format(**{
+            placeholder: get_value(*args)
+            for placeholder, get_value in self._placeholders_values
+        })
 
 
 class S3KeysService:
     def __init__(self, s3_config: dict):
         self._log_key_template = validate_key_template(s3_config['key_templates']['log'])
         self._log_key_prefix_template = validate_key_template(s3_config['key_templates']['log_prefix'])
-        self._frame_key_template = validate_key_template(s3_config['key_templates']['frame'])
-        self._crop_frame_key_template = validate_key_template(s3_config['key_templates']['crop_frame'])
+        self._frame_key = KeyFormatter(
+            validate_key_template(s3_config['key_templates']['frame']),
+            FRAME_KEY_VALUES,
+        )
+        self._crop_frame_key = KeyFormatter(
+            validate_key_template(s3_config['key_templates']['crop_frame']),
+            CROP_FRAME_KEY_VALUES,
+        )
         self._videos_key_template = validate_key_template(s3_config['key_templates']['videos'])
-        self._frame_depth_map_key_template = validate_key_template(
-            s3_config['key_templates'].get('depth_map'),
-            allow_none=True,
+        self._frame_depth_map_key = KeyFormatter(
+            validate_key_template(s3_config['key_templates'].get('depth_map'), allow_none=True),
+            DEPTH_MAP_KEY_VALUES,
         )
-        self._frame_crop_depth_map_key_template = validate_key_template(
-            s3_config['key_templates'].get('crop_depth_map'),
-            allow_none=True,
+        self._frame_crop_depth_map_key = KeyFormatter(
+            validate_key_template(s3_config['key_templates'].get('crop_depth_map'), allow_none=True),
+            CROP_DEPTH_MAP_KEY_VALUES,
         )
 
     def get_frame_key(self, frame: Frame) -> str:
-        return self._frame_key_template.format(
-            track_email=frame.track_email,
-            track_uuid=frame.track_uuid,
-            frame_date=frame.date.strftime(DATE_FORMAT),
-            frame_timestamp_ms=frame.timestamp,
-            lat=_coord_as_str(correct_round(frame.lat)),
-            lon=_coord_as_str(correct_round(frame.lon)),
-        )
+        return self._frame_key.format(frame, None)
 
     def get_crop_frame_key(self, frame: Frame, theta: int) -> str:
-        return self._crop_frame_key_template.format(
-            theta=theta,
-            track_email=frame.track_email,
-            track_uuid=frame.track_uuid,
-            frame_date=frame.date.strftime(DATE_FORMAT),
-            frame_timestamp_ms=frame.timestamp,
-            lat=_coord_as_str(correct_round(frame.lat)),
-            lon=_coord_as_str(correct_round(frame.lon)),
-        )
+        return self._crop_frame_key.format(frame, theta)
 
     def get_depth_map_key(self, frame: Frame) -> str:
-        return self._frame_depth_map_key_template.format(
-            track_email=frame.track_email,
-            track_uuid=frame.track_uuid,
-            frame_date=frame.date.strftime(DATE_FORMAT),
-            frame_timestamp_ms=frame.timestamp,
-            lat=correct_round(frame.lat),
-            lon=correct_round(frame.lon),
-        )
+        return self._frame_depth_map_key.format(frame, None)
 
     def get_crop_depth_map_key(self, frame: Frame, theta: int) -> str:
-        return self._frame_crop_depth_map_key_template.format(
-            track_email=frame.track_email,
-            track_uuid=frame.track_uuid,
-            frame_date=frame.date.strftime(DATE_FORMAT),
-            frame_timestamp_ms=frame.timestamp,
-            lat=correct_round(frame.lat),
-            lon=correct_round(frame.lon),
-            theta=theta,
-        )
+        return self._frame_crop_depth_map_key.format(frame, theta)
 
     def get_log_key(self, log: TrackLog) -> str:
         return self._log_key_template.format(
             track_uuid=log.track_uuid,
-            log_date=log.date.strftime(DATE_FORMAT),
+            log_date=format_day(log.date),
             log_timestamp_ms=log.timestamp_ms,
         )
 
     def get_log_key_prefix(self, track_uuid: str, track_date: date) -> str:
         return self._log_key_prefix_template.format(
             track_uuid=track_uuid,
-            log_date=track_date.strftime(DATE_FORMAT),
+            log_date=format_day(track_date),
         )
 
     def get_videos_key(self, track_uuid: str, resource_type: str) -> str:
@@ -89,6 +109,31 @@ class S3KeysService:
         )
 
 
+def format_day(value: date, date_format: str = DATE_FORMAT) -> str:
+    """
+    strftime для форматов с точностью до дня, кэшируется по дню, т.к. кадры трека приходятся на несколько дней
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    return _format_day(value, date_format)
+
+
+@lru_cache(maxsize=128)
+def _format_day(day: date, date_format: str) -> str:
+    return day.strftime(date_format)
+
+
+# frame coords are rounded and formatted for every key of the frame (frame, crops, depth maps)
+@lru_cache(maxsize=1024)
+def _format_coord(coord: float) -> str:
+    return _coord_as_str(_round_coord(coord))
+
+
+@lru_cache(maxsize=1024)
+def _round_coord(coord: float) -> float:
+    return correct_round(coord)
+
+
 def _coord_as_str(coord: float) -> str:
     return f'{coord:.12f}'
 
@@ -99,13 +144,29 @@ def validate_key_template(template: Optional[str], allow_none: bool = False) ->
             return template
         raise ValueError('Key template required!')
 
-    placeholders = template_placeholders_re.findall(template)
+    placeholders = _find_placeholders(template)
 
     if not placeholders:
         raise ValueError(f'Key template "{template}" not supported: no placeholders found')
 
     for placeholder in placeholders:
-        if not placeholder_key_re.match(placeholder):
+        if not placeholder or not PLACEHOLDER_CHARS.issuperset(placeholder):
             raise ValueError(f'Key template "{template}" not supported: not valid placeholder "{placeholder}"')
 
     return template
+
+
+def _find_placeholders(template: str) -> list[str]:
+    """
+    Из '{placeholder}' достает 'placeholder', незакрытые скобки игнорируются
+    """
+    placeholders = []
+    start = template.find('{')
+    while start != -1:
+        end = template.find('}', start + 1)
+        if end == -1:
+            break
+        placeholder = template[start + 1:end]
+        placeholders.append(placeholder)
+        start = template.find('{', end + 1)
+    return placeholders
@@ -3,11 +3,17 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from typing import BinaryIO, Optional
 
+from botocore.exceptions import ClientError
+
 from signs_dashboard.services.s3_client import S3ClientService
-from signs_dashboard.services.s3_keys import S3KeysService
+from signs_dashboard.services.s3_keys import S3KeysService, format_day
 
 logger = logging.getLogger(__name__)
 
+BUCKET_PARTITION_FORMAT = '%Y%m'
+# backends add defaults (Prefix, NoncurrentVersionExpiration, ...) to stored rules, compare only these
+LIFECYCLE_RULE_FIELDS = ('ID', 'Expiration', 'Filter', 'Status')
+
 
 @dataclass
 class Buckets:
@@ -21,22 +27,21 @@ class Buckets:
 
     def get_log_bucket(self, log_date: date) -> str:
         return self.logs_bucket_template.format(
-            partition=log_date.strftime('%Y%m'),
+            partition=format_day(log_date, BUCKET_PARTITION_FORMAT),
         )
 
     def get_frame_bucket(self, frame_date: date) -> str:
         legacy_bucket = self.legacy_frames_bucket
-        legacy_bucket_timestamp = self.legacy_frames_bucket_timestamp
-        if frame_date <= legacy_bucket_timestamp and legacy_bucket:
+        if legacy_bucket and frame_date <= self.legacy_frames_bucket_timestamp:
             return legacy_bucket
 
         return self.frames_bucket_template.format(
-            partition=frame_date.strftime('%Y%m'),
+            partition=format_day(frame_date, BUCKET_PARTITION_FORMAT),
         )
 
     def get_videos_bucket(self, track_date: date):
         return self.videos_bucket_template.format(
-            partition=track_date.strftime('%Y%m'),
+            partition=format_day(track_date, BUCKET_PARTITION_FORMAT),
         )
 
     def get_frame_bucket_lifecycle(self) -> Optional[dict]:
@@ -71,6 +76,8 @@ def _as_bucket_name_template(bucket_prefix: str) -> str:
 class S3Service:
     def __init__(self, s3_client: S3ClientService, s3_config: dict, s3_keys: S3KeysService):
         self._s3_client = s3_client
+        # buckets that exist or were created by this process, uploads to them skip bucket checks
+        self._existing_buckets: set[str] = set()
         legacy_bucket_tstamp = s3_config.get('legacy_bucket_timestamp', 0)
         self.buckets = Buckets(
             frames_bucket_template=_as_bucket_name_template(s3_config['bucket_prefix']),
@@ -85,10 +92,7 @@ class S3Service:
         self.base_url = s3_config['client_params']['endpoint_url']
 
     def list_objects_if_bucket_exists(self, bucket: str, prefix: str):
-        if not self._s3_client.is_bucket_exist(bucket):
-            return []
-
-        return self._s3_client.list_objects(
+        return self._s3_client.list_objects_if_bucket_exists(
             prefix=prefix,
             bucket=bucket,
         )
@@ -96,6 +100,9 @@ class S3Service:
     def download_fileobj(self, bucket: str, key: str, fileobj: BinaryIO):
         return self._s3_client.download_fileobj(bucket=bucket, key=key, fileobj=fileobj)
 
+    def download_bytes(self, bucket: str, key: str) -> bytes:
+        return self._s3_client.get_object_bytes(bucket=bucket, key=key)
+
     def upload_fileobj(
         self,
         bucket: str,
@@ -104,7 +111,9 @@ class S3Service:
         fileobj: BinaryIO,
         extra_args: Optional[dict] = None,
     ):
-        self._s3_client.create_bucket_if_not_exists(bucket)
+        if bucket not in self._existing_buckets:
+            self._s3_client.create_bucket_if_not_exists(bucket)
+            self._existing_buckets.add(bucket)
 
         self._s3_client.upload_fileobj(
             fileobj=fileobj,
@@ -114,6 +123,26 @@ class S3Service:
             extra_args=extra_args,
         )
 
+    def put_object(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str,
+        body: bytes,
+        extra_args: Optional[dict] = None,
+    ):
+        if bucket not in self._existing_buckets:
+            self._s3_client.create_bucket_if_not_exists(bucket)
+            self._existing_buckets.add(bucket)
+
+        self._s3_client.put_object(
+            body=body,
+            bucket=bucket,
+            key=key,
+            content_type=content_type,
+            extra_args=extra_args,
+        )
+
     def upload_to_frames_bucket(
         self,
         bucket: str,
@@ -122,7 +151,9 @@ class S3Service:
         fileobj: BinaryIO,
         extra_args: Optional[dict] = None,
     ):
-        self._create_bucket_for_frames(bucket)
+        if bucket not in self._existing_buckets:
+            self._create_bucket_for_frames(bucket)
+            self._existing_buckets.add(bucket)
 
         self._s3_client.upload_fileobj(
             fileobj=fileobj,
@@ -133,10 +164,24 @@ class S3Service:
         )
 
     def _create_bucket_for_frames(self, bucket: str):
+        # called once per bucket, guarded by _existing_buckets
+        configuration = self.buckets.get_frame_bucket_lifecycle()
         created = self._s3_client.create_bucket_if_not_exists(bucket)
-        if not created:
+        if not configuration:
             return
 
-        configuration = self.buckets.get_frame_bucket_lifecycle()
-        if configuration:
-            self._s3_client.set_bucket_lifecycle_configuration(bucket, configuration)
+        try:
+            existing = None if created else self._s3_client.get_bucket_lifecycle_configuration(bucket)
+            if not existing or _lifecycle_rules(existing) != _lifecycle_rules(configuration):
+                logger.info(f'Setting lifecycle configuration for bucket {bucket}')
+                self._s3_client.set_bucket_lifecycle_configuration(bucket, configuration)
+        except ClientError:
+            # lifecycle is not critical for uploads, it will be retried after restart
+            logger.exception(f'Unable to set lifecycle configuration for bucket {bucket}')
+
+
+def _lifecycle_rules(configuration: dict) -> list[dict]:
+    return [
+        {field: rule.get(field) for field in LIFECYCLE_RULE_FIELDS}
+        for rule in configuration.get('Rules', [])
+    ]
@@ -1,19 +1,27 @@
 from dataclasses import dataclass
-from typing import Optional
 
+import numpy as np
 import shapely
-from shapely.geometry import LineString, MultiLineString
-
-
-@dataclass
-class TrackPoint:
-    coords: list[float]
-    speed: Optional[float] = None
+from shapely.geometry import MultiLineString
 
 
 @dataclass
 class Track:
-    points: list[TrackPoint]
+    coords: np.ndarray  # (N, 2) float64 array of (lon, lat)
+    speeds: np.ndarray  # (N,) float64 array, NaN for unknown speed
+
+    @classmethod
+    def from_gps_points(cls, gps_points: list) -> 'Track':
+        """
+        Builds track from ([lon, lat], speed) pairs, unknown (None) speeds become NaN
+        """
+        return cls(
+            coords=np.array([point[0] for point in gps_points], dtype=np.float64).reshape(-1, 2),
+            speeds=np.array([point[1] for point in gps_points], dtype=np.float64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.coords)
 
 
 @dataclass
@@ -27,63 +35,74 @@ class TrackGPSPointsHandlerService:
         self._simplify_tolerance = 0.00001  # ~ meters per degree
 
     def optimize(self, track: Track) -> Track:
-        self._remove_duplicate_coords_points(track)
-        self._remove_zero_speed_points(track)
-
-        if len(track.points) == 1:
+        if not len(track):
+            return track
+
+        coords, speeds = track.coords, track.speeds
+        deduplicated_idx = np.flatnonzero(_not_repeated_coords_mask(coords))
+        points_idx = deduplicated_idx[_not_repeated_zero_speed_mask(speeds[deduplicated_idx])]
+        # last point of the track is always kept
+        last_idx = deduplicated_idx[-1]
+        if points_idx[-1] != last_idx and not _is_same_point(coords, speeds, points_idx[-1], last_idx):
+            points_idx = np.append(points_idx, last_idx)
+
+        if len(points_idx) == 1:
             # if there is a track with 1 point, there are conditions on shapely objects
-            track.points.append(track.points[0])
-        else:
-            self._simplify(track)
-        return track
+            points_idx = np.repeat(points_idx, 2)
+            return Track(coords=coords[points_idx], speeds=speeds[points_idx])
+        return self._simplify(coords[points_idx])
 
     @staticmethod
     def get_daily_geometry(tracks: list[Track], wkt_precision: int = 6) -> TrackGeometry:
-        multilinestring = MultiLineString(
-            [[point.coords for point in track.points] for track in tracks],
-        )
+        if tracks:
+            coords = np.concatenate([track.coords for track in tracks])
+            line_indices = np.repeat(np.arange(len(tracks)), [len(track) for track in tracks])
+            multilinestring = shapely.multilinestrings(shapely.linestrings(coords, indices=line_indices))
+        else:
+            multilinestring = MultiLineString()
 
         return TrackGeometry(
             gps_track_wkt=_remove_extra_spaces(shapely.to_wkt(multilinestring, rounding_precision=wkt_precision)),
             centroid_wkt=multilinestring.centroid.wkt,
         )
 
-    @staticmethod
-    def _remove_duplicate_coords_points(track: Track):
-        optimized_points = []
-        last_coords = None
-        for point in track.points:
-            if last_coords and last_coords == point.coords:
-                continue
-            last_coords = point.coords
-            optimized_points.append(point)
-        track.points = optimized_points
+    def _simplify(self, coords: np.ndarray) -> Track:
+        # TODO: explore different coordinate systems if higher accuracy is needed
+        simplified_linestring = shapely.simplify(shapely.linestrings(coords), self._simplify_tolerance)
+        simplified_coords = shapely.get_coordinates(simplified_linestring)
 
-    @staticmethod
-    def _remove_zero_speed_points(track: Track):
-        optimized_points = []
-        for point in track.points:
-            if point.speed:
-                optimized_points.append(point)
-            elif not optimized_points or optimized_points[-1].speed != 0:
-                optimized_points.append(point)
+        return Track(coords=simplified_coords, speeds=np.full(len(simplified_coords), np.nan))
 
-        try:
-            if optimized_points[-1] != track.points[-1]:
-                optimized_points.append(track.points[-1])
-        except IndexError:
-            pass  # noqa: WPS420
 
-        track.points = optimized_points
+def _not_repeated_coords_mask(coords: np.ndarray) -> np.ndarray:
+    mask = np.ones(len(coords), dtype=bool)
+    mask[1:] = np.any(coords[1:] != coords[:-1], axis=1)
+    return mask
 
-    def _simplify(self, track: Track):
-        linestring = LineString([point.coords for point in track.points])
 
-        # TODO: explore different coordinate systems if higher accuracy is needed
-        simplified_linestring = linestring.simplify(self._simplify_tolerance)
+def _not_repeated_zero_speed_mask(speeds: np.ndarray) -> np.ndarray:
+    """
+    Keeps points with non-zero speed and only the first point of each zero speed run.
+
+    Points with unknown speed (NaN) are dropped inside zero speed run, but do not break it.
+    """
+    is_unknown = np.isnan(speeds)
+    is_zero = speeds == 0
+    known_idx = np.where(is_unknown, -1, np.arange(len(speeds)))
+    last_known_idx = np.maximum.accumulate(known_idx)
+    outside_zero_run = (last_known_idx < 0) | ~is_zero[np.maximum(last_known_idx, 0)]
+
+    mask = ~(is_unknown | is_zero)
+    mask[0] = True
+    mask[1:] |= outside_zero_run[:-1]
+    return mask
+
 
-        track.points = [TrackPoint(coords=coords) for coords in list(simplified_linestring.coords)]
+def _is_same_point(coords: np.ndarray, speeds: np.ndarray, idx: int, other_idx: int) -> bool:
+    same_speed = speeds[idx] == speeds[other_idx] or (np.isnan(speeds[idx]) and np.isnan(speeds[other_idx]))
+    return bool(same_speed and np.array_equal(coords[idx], coords[other_idx]))
 
 
 def _remove_extra_spaces(wkt_string: str) -> str:
-    return wkt_string.replace(', ', ',').replace('MULTILINESTRING (', 'MULTILINESTRING(')
+    # str.replace runs in C, it is faster than a single regex pass with replacement callback
+    return wkt_string.replace(', ', ',').replace('MULTILINESTRING (', 'MULTILINESTRING(', 1)
@@ -1,28 +1,14 @@
-from geopy.distance import GeodesicDistance
+import numpy as np
+from pyproj import Geod
 
+WGS84_GEOD = Geod(ellps='WGS84')
 
-class TrackLengthService:
-    def __init__(self):
-        self._geodesic = GeodesicDistance(
-            ellipsoid='WGS-84',
-        )
 
+class TrackLengthService:
     def calculate_length_km(self, points: list[dict]):
-        length = sum([
-            self._geodesic.measure(
-                _track_point_as_latlon(point1),
-                _track_point_as_latlon(point2),
-            )
-            for point1, point2 in pairwise(points)
-        ])
-        return round(length, 3)
-
-
-def _track_point_as_latlon(point: dict):
-    return point['latitude'], point['longitude']
-
-
-def pairwise(iterable):
-    # pairwise('ABCDEFG') --> AB BC CD DE EF FG
-    # todo: use itertools.pairwise in python3.10+
-    return zip(iterable[:-1], iterable[1:])
+        if len(points) < 2:
+            return 0
+        lats = np.fromiter((point['latitude'] for point in points), dtype=np.float64, count=len(points))
+        lons = np.fromiter((point['longitude'] for point in points), dtype=np.float64, count=len(points))
+        length_m = WGS84_GEOD.line_length(lons, lats)
+        return round(length_m / 1000, 3)
@@ -1,6 +1,7 @@
-import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
+from functools import partial
 from typing import List, Optional
 
 from dateutil.relativedelta import relativedelta
@@ -9,6 +10,8 @@ from signs_dashboard.models.track_upload_status import TrackUploadStatus
 from signs_dashboard.schemas.track_log import LogFileOnS3, TrackLog
 from signs_dashboard.services.s3_service import S3Service
 
+AROUND_DATE_MONTHS_OFFSETS = (-1, 0, 1)
+
 
 class TrackLogsService:
 
@@ -16,11 +19,13 @@ class TrackLogsService:
         self._s3_service = s3_service
 
     def find_track_logs_around_date(self, track_uuid: str, track_date: date) -> List[LogFileOnS3]:
-        return [
-            *self._find_track_logs(track_uuid, track_date - relativedelta(months=1)),
-            *self._find_track_logs(track_uuid, track_date),
-            *self._find_track_logs(track_uuid, track_date + relativedelta(months=1)),
-        ]
+        # monthly partitions around date are listed concurrently
+        with ThreadPoolExecutor(max_workers=len(AROUND_DATE_MONTHS_OFFSETS)) as executor:
+            partitions_logs = list(executor.map(
+                partial(self._find_track_logs, track_uuid),
+                [track_date + relativedelta(months=months) for months in AROUND_DATE_MONTHS_OFFSETS],
+            ))
+        return [log_file for partition_logs in partitions_logs for log_file in partition_logs]
 
     def find_track_log(
         self,
@@ -39,8 +44,8 @@ class TrackLogsService:
         key = self._s3_service.keys.get_log_key(log)
         logging.debug('Upload log bucket=%s, key=%s', bucket, key)
 
-        self._s3_service.upload_fileobj(
-            fileobj=io.BytesIO(log.log_data),
+        self._s3_service.put_object(
+            body=log.log_data,
             bucket=bucket,
             key=key,
             content_type='text/plain',
@@ -55,14 +60,10 @@ class TrackLogsService:
         if not s3_file:
             return None
 
-        log_file_bytes = io.BytesIO()
-        self._s3_service.download_fileobj(
+        return self._s3_service.download_bytes(
             bucket=s3_file.bucket,
             key=s3_file.key,
-            fileobj=log_file_bytes,
         )
-        log_file_bytes.seek(0)
-        return log_file_bytes.read()
 
     def _find_track_logs(self, track_uuid: str, track_date: date) -> List[LogFileOnS3]:
         bucket = self._s3_service.buckets.get_log_bucket(track_date)
@@ -21,20 +21,28 @@ from signs_dashboard.services.events.tracks_lifecycle import TracksLifecycleServ
 from signs_dashboard.services.track_gps_points_handler import (
     Track as TrackPoints,
     TrackGPSPointsHandlerService,
-    TrackPoint,
 )
 from signs_dashboard.services.users import UsersService
 from signs_dashboard.small_utils import correct_round
 
-SORT_DATE_FORMAT = '%Y-%m-%d'  # noqa: WPS323
 logger = logging.getLogger(__name__)
 
+FIJI_UPLOADING_STATUSES = (
+    TrackStatuses.UPLOADING,
+    TrackStatuses.FORCED_SEND,
+    TrackStatuses.SENT_FIJI,
+    TrackStatuses.FIJI_SENDING_IN_PROCESS,
+)
+PRO_UPLOADING_STATUSES = (
+    TrackStatuses.UPLOADING,
+    TrackStatuses.SENT_PRO_WITHOUT_PREDICTIONS,
+    TrackStatuses.FORCED_SEND,
+    TrackStatuses.WILL_BE_HIDDEN_PRO,
+)
+
 
-def _sort_key(track_stat: TrackStatistics):
-    return '{date}_{email}'.format(
-        date=track_stat.date.strftime(SORT_DATE_FORMAT),
-        email=track_stat.track.user_email,
-    )
+def _sort_key(track_stat: TrackStatistics) -> tuple[date, str]:
+    return track_stat.date.date(), track_stat.track.user_email or ''
 
 
 class TracksService:
@@ -55,18 +63,15 @@ class TracksService:
         self._tracks_lifecycle_service = tracks_lifecycle_service
         self._track_gps_points_handler_service = track_gps_points_handler_service
         self._modules_config = modules_config
-
-    @property
-    def default_localization_status(self):
-        if self._modules_config.is_track_localization_enabled():
-            return TrackStatuses.LOCALIZATION_PENDING
-        return TrackStatuses.LOCALIZATION_DISABLED
-
-    @property
-    def default_map_matching_status(self):
-        if self._modules_config.is_map_matching_enabled():
-            return TrackStatuses.MAP_MATCHING_PENDING
-        return TrackStatuses.MAP_MATCHING_DISABLED
+        # modules config doesn't change after startup
+        if modules_config.is_track_localization_enabled():
+            self.default_localization_status = TrackStatuses.LOCALIZATION_PENDING
+        else:
+            self.default_localization_status = TrackStatuses.LOCALIZATION_DISABLED
+        if modules_config.is_map_matching_enabled():
+            self.default_map_matching_status = TrackStatuses.MAP_MATCHING_PENDING
+        else:
+            self.default_map_matching_status = TrackStatuses.MAP_MATCHING_DISABLED
 
     def find_tracks_by_query_params(self, query_params: TrackQueryParameters) -> list[Track]:
         return self._tracks_repository.find(query_params, tracks_only=True)
@@ -95,23 +100,13 @@ class TracksService:
 
     def get_fiji_uploading_tracks(self, fiji_retries: int, fiji_retries_timeout: int) -> list[Track]:
         return self._tracks_repository.find_with_retries_requests_by_fiji_status(
-            [
-                TrackStatuses.UPLOADING,
-                TrackStatuses.FORCED_SEND,
-                TrackStatuses.SENT_FIJI,
-                TrackStatuses.FIJI_SENDING_IN_PROCESS,
-            ],
+            FIJI_UPLOADING_STATUSES,
             max_retries=fiji_retries,
             retries_timeout=fiji_retries_timeout,
         )
 
     def get_pro_uploading_tracks(self) -> list[Track]:
-        return self._tracks_repository.find_by_pro_status([
-            TrackStatuses.UPLOADING,
-            TrackStatuses.SENT_PRO_WITHOUT_PREDICTIONS,
-            TrackStatuses.FORCED_SEND,
-            TrackStatuses.WILL_BE_HIDDEN_PRO,
-        ])
+        return self._tracks_repository.find_by_pro_status(PRO_UPLOADING_STATUSES)
 
     def get_localization_pending_tracks(
         self,
@@ -279,6 +274,12 @@ class TracksService:
     def get_upload_status(self, track_uuid: str) -> TrackUploadStatus:
         return self._tracks_repository.get_upload_status(track_uuid)
 
+    def get_upload_status_with_frames_count(self, track_uuid: str) -> tuple[TrackUploadStatus, int]:
+        return self._tracks_repository.get_upload_status_with_frames_count(track_uuid)
+
+    def get_upload_statuses(self, track_uuids: list[str], with_gps_points: bool = True) -> dict[str, TrackUploadStatus]:
+        return self._tracks_repository.get_upload_statuses(track_uuids, with_gps_points=with_gps_points)
+
     def save_upload_status(self, upload_status: TrackUploadStatus):
         self._tracks_repository.save_upload_status(upload_status)
 
@@ -296,25 +297,16 @@ class TracksService:
                 api_user=api_user,
             )
 
+        tracks_info = self._tracks_repository.get_daily_gps_tracks_info(tracks_uuids)
         optimized_daily_tracks = []
         for track_uuid in tracks_uuids:
-            track_info = self._tracks_repository.get_daily_gps_track_info(track_uuid)
+            track_info = tracks_info.get(track_uuid)
             if not track_info:
                 logger.info(f'No track info extracted for {track_uuid}')
                 continue
             logger.debug(f'Daily track info: {track_info}')
             optimized_daily_tracks.append(
-                self._track_gps_points_handler_service.optimize(
-                    TrackPoints(
-                        points=[
-                            TrackPoint(
-                                coords=track_point[0],
-                                speed=track_point[1],
-                            )
-                            for track_point in track_info
-                        ],
-                    ),
-                ),
+                self._track_gps_points_handler_service.optimize(TrackPoints.from_gps_points(track_info)),
             )
 
         daily_geometry = self._track_gps_points_handler_service.get_daily_geometry(optimized_daily_tracks)
@@ -357,11 +349,10 @@ class TracksService:
         status: int,
         last_done: Optional[datetime] = None,
     ):
-        for detector_name in detectors:
-            self._tracks_localization_repository.create_or_update(
-                track_uuid=track_uuid,
-                detector_name=detector_name,
-                status=status,
-                last_done=last_done,
-            )
+        self._tracks_localization_repository.bulk_create_or_update(
+            track_uuid=track_uuid,
+            detector_names=detectors,
+            status=status,
+            last_done=last_done,
+        )
         self.change_localization_status(track_uuid, status)
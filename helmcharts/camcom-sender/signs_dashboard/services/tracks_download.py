@@ -1,9 +1,11 @@
-import base64
+import binascii
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Optional
 
 from signs_dashboard.errors.service import ImageReadError
 from signs_dashboard.models.frame import Frame
+from signs_dashboard.models.track_upload_status import TrackUploadStatus
 from signs_dashboard.modules_config import ModulesConfig
 from signs_dashboard.services.frames import FramesService
 from signs_dashboard.services.image import ImageService
@@ -12,6 +14,8 @@ from signs_dashboard.services.tracks import Track, TracksService
 
 logger = logging.getLogger(__name__)
 
+UNIX_EPOCH = datetime(1970, 1, 1)  # naive UTC, as recorded time is stored
+
 
 class TracksDownloaderService:
     def __init__(
@@ -72,12 +76,13 @@ class TracksDownloaderService:
         #  надо сохранить перед ntv потому что денормализация
         self._tracks_service.save_upload_status(upload_status)
 
-        if self._is_track_uploaded(track_uuid):
+        if self._is_track_uploaded(track_uuid, upload_status=upload_status):
             self._tracks_service.mark_track_as_uploaded(track_uuid)
 
     def download_frame(self, message_body: dict, track_uuid: str) -> Frame:
         try:
-            image_bytes = base64.b64decode(message_body['frame'])
+            # a2b_base64 accepts ASCII str, so payload is not copied into bytes before decoding
+            image_bytes = binascii.a2b_base64(message_body['frame'])
         except Exception:
             logger.exception(f'Unable to decode frame for track {track_uuid}')
             raise ImageReadError(key=track_uuid)
@@ -98,15 +103,18 @@ class TracksDownloaderService:
     def get_track(self, uuid: str) -> Track:
         return self._tracks_service.get(uuid)
 
-    def _is_track_uploaded(self, track_uuid: str) -> bool:
-        status = self._tracks_service.get_upload_status(track_uuid)
-        frames_count = self._frames_service.count_by_track(track_uuid)
+    def _is_track_uploaded(self, track_uuid: str, upload_status: Optional[TrackUploadStatus] = None) -> bool:
+        if upload_status is None:
+            upload_status, frames_count = self._tracks_service.get_upload_status_with_frames_count(track_uuid)
+            return upload_status.is_ready_to_send() and frames_count == upload_status.expected_frames_count
 
-        return status.is_ready_to_send() and frames_count == status.expected_frames_count
+        # just saved upload status is not expired on commit, so it is not loaded again
+        if not upload_status.is_ready_to_send():
+            return False
+        return self._frames_service.count_by_track(track_uuid) == upload_status.expected_frames_count
 
 
 def _get_recorded_time(points):
     if not points:
         return None
-    timestamp = points[0]['timestamp'] / 1e3
-    return datetime.utcfromtimestamp(timestamp)
+    return UNIX_EPOCH + timedelta(milliseconds=points[0]['timestamp'])
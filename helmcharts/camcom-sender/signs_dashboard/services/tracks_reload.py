@@ -20,7 +20,7 @@ from signs_dashboard.query_params.tracks_reload import ForeignTrackReloadQueryPa
 from signs_dashboard.repository.tracks_reload import ReloadedTracksRepository
 from signs_dashboard.services.fiji_client import FijiClient
 from signs_dashboard.services.frames import FramesService
-from signs_dashboard.services.kafka_service import KafkaService
+from signs_dashboard.services.kafka_service import PRODUCER_PROFILE_FAST, KafkaService
 from signs_dashboard.services.tracks import TracksService
 
 _JPG_EXTENSIONS = ('.jpg', '.jpeg', '.JPG', '.JPEG')
@@ -118,7 +118,7 @@ class TracksReloadService:
         tasks_hashes = [_get_task_hash(track_id) for track_id in ids_for_work]
         tracks = [track for track in tracks if track.uuid in ids_for_work]
 
-        producer = self._kafka_service.get_producer()
+        producer = self._kafka_service.get_producer(profile=PRODUCER_PROFILE_FAST)
         for track, task_hash, track_new_id in zip(tracks, tasks_hashes, track_new_ids):
             self._reloaded_tracks_repository.create_pending_task(track.uuid, track_new_id, task_hash)
             future = producer.send(
@@ -136,7 +136,7 @@ class TracksReloadService:
                 logger.error(f'Fail send message with error {err}')
                 self._reloaded_tracks_repository.set_task_status(task_hash, 'error')
 
-        producer.close()
+        producer.flush()
         return {
             'upload_tracks': ids_for_work,
             'skip_tracks': list(skipped_ids),
@@ -9,7 +9,7 @@ from signs_dashboard.schemas.events.detected_objects_lifecycle import DetectedOb
 from signs_dashboard.schemas.events.frame_lifecycle import FrameEventType
 from signs_dashboard.services.detected_objects import DetectedObjectsService
 from signs_dashboard.services.frames import FramesService
-from signs_dashboard.services.kafka_service import KafkaService
+from signs_dashboard.services.kafka_service import KafkaService, utf8_serializer
 from signs_dashboard.services.prediction import IZ_PREDICTOR_NAME, PredictionService
 from signs_dashboard.services.tracks import TracksService
 from signs_dashboard.services.twogis_pro.kafka.drivers import TwoGisProDriversService
@@ -45,8 +45,8 @@ class TwoGisProSyncService:
         self._kafka_service = kafka_service
 
         self._producer = self._kafka_service.get_producer(
-            key_serializer=lambda key: key.encode('utf-8'),
-            value_serializer=lambda val: val.encode('utf-8'),
+            key_serializer=utf8_serializer,
+            value_serializer=utf8_serializer,
             max_request_size=5 * 1024 * 1024,  # 5 MB
         )
 
@@ -124,8 +124,7 @@ class VideoFramesSaverService:
                 logger.info(f'Begin inserting to DB {len(frames_batch)} frames')
                 self._frames_repository.bulk_insert(frames_batch)
                 logger.info('Done inserting to DB, calculating frames interest zones')
-                for new_frame in frames_batch:
-                    self._interest_zones_service.update_frame_interest_zones(new_frame)
+                self._interest_zones_service.update_frames_interest_zones(frames_batch)
                 logger.info('Done calculating frames interest zones')
                 frames_batch = []
 
@@ -5,6 +5,7 @@ from typing import Optional
 
 from cachetools import LRUCache
 from dependency_injector.wiring import Provide, inject
+from kafka.consumer.fetcher import ConsumerRecord
 
 from signs_dashboard.containers.application import Application
 from signs_dashboard.context import ContextService
@@ -18,7 +19,7 @@ from signs_dashboard.services.camcom.camcom_sender import CamcomSenderService
 from signs_dashboard.services.events.frames_lifecycle import FramesLifecycleService
 from signs_dashboard.services.frames import FramesService
 from signs_dashboard.services.interest_zones import InterestZonesService
-from signs_dashboard.services.kafka_service import KafkaService, commit_single_message
+from signs_dashboard.services.kafka_service import KafkaService, commit_batch, poll_batches
 from signs_dashboard.services.prediction import PredictionService
 from signs_dashboard.services.predictors import PredictorsService
 from signs_dashboard.services.tracks_download import TracksDownloaderService
@@ -32,25 +33,30 @@ def download_tracks(
     download_service: TracksDownloaderService = Provide[Application.services.tracks_downloader],
 ):
     consumer = kafka_service.get_tracks_consumer()
-    for message in consumer:
-        partition, offset = message.partition, message.offset
-        key = parse_message_key(message)
-        if not key:
-            logger.error(f'Kafka message with empty key: {message}')
-            commit_single_message(consumer, message)
-            continue
-
-        with ContextService(track_uuid=key):
-            meta_info = f'key: {key}, partition: {partition}, offset: {offset}'
-            logger.warning(f'Kafka recieve message with {meta_info}')
-            request_data = json.loads(message.value)
-            request_type = request_data.get('type')
-            meta_info = f'{meta_info}, type: {request_type}'
-            logger.warning(f'Kafka start process message with {meta_info}')
-            event_dt = datetime.utcfromtimestamp(message.timestamp / 1e3)
-            download_service.download_track(request_data, key, event_dt)
-            commit_single_message(consumer, message)
-            logger.warning(f'Kafka Commit message with {meta_info}')
+    for messages in poll_batches(consumer):
+        for message in messages:
+            _download_track(message, download_service)
+        commit_batch(consumer, messages)
+        logger.warning(f'Kafka Commit {len(messages)} messages')
+
+
+def _download_track(message: ConsumerRecord, download_service: TracksDownloaderService):
+    partition, offset = message.partition, message.offset
+    key = parse_message_key(message)
+    if not key:
+        logger.error(f'Kafka message with empty key: {message}')
+        return
+
+    with ContextService(track_uuid=key):
+        meta_info = f'key: {key}, partition: {partition}, offset: {offset}'
+        logger.warning(f'Kafka recieve message with {meta_info}')
+        request_data = json.loads(message.value)
+        request_type = request_data.get('type')
+        meta_info = f'{meta_info}, type: {request_type}'
+        logger.warning(f'Kafka start process message with {meta_info}')
+        event_dt = datetime.utcfromtimestamp(message.timestamp / 1e3)
+        download_service.download_track(request_data, key, event_dt)
+        logger.warning(f'Kafka processed message with {meta_info}')
 
 
 @inject
@@ -63,21 +69,14 @@ def download_frames(  # noqa: WPS231
 ):
     consumer = kafka_service.get_frames_consumer()
     track_uuid2track_type = LRUCache(maxsize=100000)
-    for message in consumer:
-        key = parse_message_key(message)
-        if not key:
-            logger.error(f'Kafka message with empty key: {message}')
-            commit_single_message(consumer, message)
-            continue
-
-        try:
-            message_body = json.loads(message.value)
-            frame = download_service.download_frame(message_body, key)
-        except ImageReadError:
-            logger.exception(f'Unable to read image from message with key={key}, skipped')
-            frame = None
-
-        if frame:
+    for messages in poll_batches(consumer):
+        messages_frames = [(message, _download_frame(message, download_service)) for message in messages]
+        interest_zones_service.update_frames_interest_zones([frame for _, frame in messages_frames if frame])
+
+        for _, frame in messages_frames:
+            if not frame:
+                continue
+
             required_predictors = predictors.get_active_predictors()
             track_type = _get_track_type(frame.track_uuid, track_uuid2track_type, download_service)
 
@@ -86,14 +85,27 @@ def download_frames(  # noqa: WPS231
             # фрейм всё равно отправится на глубину. Но это очень редкий случай
             if track_type == 'dashcam':
                 required_predictors = [name for name in required_predictors if name != 'depth-detection']
-            interest_zones_service.update_frame_interest_zones(frame)
             frames_lifecycle_service.produce_uploaded_event(
                 frame,
                 required_predictors=required_predictors,
                 prompt=predictors.get_prompt(),
             )
 
-        commit_single_message(consumer, message)
+        commit_batch(consumer, messages)
+
+
+def _download_frame(message: ConsumerRecord, download_service: TracksDownloaderService) -> Optional[Frame]:
+    key = parse_message_key(message)
+    if not key:
+        logger.error(f'Kafka message with empty key: {message}')
+        return None
+
+    try:
+        message_body = json.loads(message.value)
+        return download_service.download_frame(message_body, key)
+    except ImageReadError:
+        logger.exception(f'Unable to read image from message with key={key}, skipped')
+        return None
 
 
 def _get_track_type(
@@ -111,7 +123,7 @@ def _get_track_type(
 
 
 @inject
-def download_predictions(  # noqa: C901, WPS231
+def download_predictions(
     camcom_sender_service: CamcomSenderService = Provide[Application.services.camcom_sender],
     frames_service: FramesService = Provide[Application.services.frames],
     frames_lifecycle_service: FramesLifecycleService = Provide[Application.services.frames_lifecycle],
@@ -121,43 +133,62 @@ def download_predictions(  # noqa: C901, WPS231
 ):
     consumer = kafka_service.get_predictions_consumer()
 
-    for message in consumer:
-        key = parse_message_key(message)
-        if not key:
-            logger.error(f'Kafka message with empty key: {message}')
-            commit_single_message(consumer, message)
-            continue
-        message_body = json.loads(message.value)
-
-        predictor_name_override = None
-        if message.topic != kafka_service.get_unified_predictions_topic():
-            predictor_name_override = kafka_service.get_predictor_by_topic(message.topic)
-
-        if predictor_name_override in {'labels', 'signs', 'surface'} and 'ts' not in message_body.get('meta', {}):
-            # особенность воркеров на фреймворке mlgis
-            continue
+    for messages in poll_batches(consumer):
+        for message in messages:
+            _process_prediction_message(
+                message,
+                camcom_sender_service=camcom_sender_service,
+                frames_service=frames_service,
+                frames_lifecycle_service=frames_lifecycle_service,
+                prediction_service=prediction_service,
+                kafka_service=kafka_service,
+                modules_config=modules_config,
+            )
+        commit_batch(consumer, messages)
 
-        frame, predictor_name = _save_predictions(
-            key,
-            message_body,
-            predictor_name_override=predictor_name_override,
-            frames_service=frames_service,
-            prediction_service=prediction_service,
-        )
-        if frame and predictor_name == 'camcom':
-            _update_camcom_job(key, frame, camcom_sender_service=camcom_sender_service)
 
-        if frame:
-            frames_lifecycle_service.produce_predicted_event(frame)
+def _process_prediction_message(  # noqa: C901, WPS231
+    message: ConsumerRecord,
+    camcom_sender_service: CamcomSenderService,
+    frames_service: FramesService,
+    frames_lifecycle_service: FramesLifecycleService,
+    prediction_service: PredictionService,
+    kafka_service: KafkaService,
+    modules_config: ModulesConfig,
+):
+    key = parse_message_key(message)
+    if not key:
+        logger.error(f'Kafka message with empty key: {message}')
+        return
+    message_body = json.loads(message.value)
+
+    predictor_name_override = None
+    if message.topic != kafka_service.get_unified_predictions_topic():
+        predictor_name_override = kafka_service.get_predictor_by_topic(message.topic)
+
+    if predictor_name_override in {'labels', 'signs', 'surface'} and 'ts' not in message_body.get('meta', {}):
+        # особенность воркеров на фреймворке mlgis
+        return
+
+    frame, predictor_name = _save_predictions(
+        key,
+        message_body,
+        predictor_name_override=predictor_name_override,
+        frames_service=frames_service,
+        prediction_service=prediction_service,
+    )
+    if frame and predictor_name == 'camcom':
+        _update_camcom_job(key, frame, camcom_sender_service=camcom_sender_service)
 
-            if _signboard_text_recognition_required(predictor_name, modules_config):
-                frames_lifecycle_service.produce_prediction_on_bboxes_required_event(
-                    frame=frame,
-                    required_predictors=['signboard-text-recognition'],
-                    bboxes=prediction_service.get_bbox_predictions_by_frame_and_detector(frame, 'signboard-detection'),
-                )
+    if frame:
+        frames_lifecycle_service.produce_predicted_event(frame)
 
-        commit_single_message(consumer, message)
+        if _signboard_text_recognition_required(predictor_name, modules_config):
+            frames_lifecycle_service.produce_prediction_on_bboxes_required_event(
+                frame=frame,
+                required_predictors=['signboard-text-recognition'],
+                bboxes=prediction_service.get_bbox_predictions_by_frame_and_detector(frame, 'signboard-detection'),
+            )
 
 
 def _save_predictions(